@@ -16,8 +16,12 @@ Examples:
 """
 import argparse
 import logging
+import multiprocessing
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Any, Callable
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format="%(message)s")
@@ -44,7 +48,9 @@ try:
         export_midas_to_onnx,
         export_yolo_to_onnx,
         DEFAULT_MIDAS_MODEL,
+        ORT_OPTIMIZATION_LEVELS,
         DEFAULT_MIDAS_REPO,
+        shared_model_cache_dir,
     )
 except ImportError as e:
     logger.error("Failed to import backend modules: %s", e)
@@ -69,6 +75,21 @@ def parse_args() -> argparse.Namespace:
         default="yolo11n.pt",
         help="YOLO model path or name (default: yolo11n.pt)",
     )
+    parser.add_argument(
+        "--yolo-sha256",
+        type=str,
+        default=None,
+        help="Expected SHA-256 of the YOLO weights; a cached file that does "
+        "not match is downloaded again",
+    )
+    parser.add_argument(
+        "--shared-cache",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Reuse YOLO weights through the per-user cache "
+        "($XDG_CACHE_HOME/robot-visual-perception/models), hardlinked into "
+        "the output directory",
+    )
     parser.add_argument(
         "--yolo-onnx-output",
         type=Path,
@@ -116,6 +137,61 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--onnx-opset", type=int, default=18, help="ONNX opset version")
     parser.add_argument("--onnx-simplify", action="store_true", default=True)
     parser.add_argument("--no-onnx-simplify", action="store_false", dest="onnx_simplify")
+    parser.add_argument(
+        "--half",
+        action=argparse.BooleanOptionalAction,
+        default=config.ONNX_HALF_PRECISION,
+        help="Convert exported ONNX models to FP16 (default: ONNX_HALF_PRECISION)",
+    )
+    parser.add_argument(
+        "--int8",
+        action="store_true",
+        help="Also write dynamically INT8-quantized copies (<name>.int8.onnx) for CPU inference",
+    )
+    parser.add_argument(
+        "--int8-calib-dir",
+        type=Path,
+        default=None,
+        help="With --int8, statically quantize the YOLO copy, calibrated on up "
+        "to 32 sample images from this directory",
+    )
+    parser.add_argument(
+        "--dynamic-shape",
+        action="store_true",
+        help="Export with dynamic batch/height/width axes instead of the fixed "
+        "input size (fixed shapes let ORT/TensorRT specialize kernels)",
+    )
+    parser.add_argument(
+        "--dynamic-batch",
+        action="store_true",
+        help="Export with a dynamic batch axis so several frames can be run in "
+        "one call (YOLO exports then have all axes dynamic)",
+    )
+    parser.add_argument(
+        "--ort-optimize",
+        action="store_true",
+        help="Also write ONNX Runtime optimized copies (<name>_opt.onnx); "
+        "these are tied to the ORT version and hardware they were built on",
+    )
+    parser.add_argument(
+        "--ort-opt-level",
+        choices=list(ORT_OPTIMIZATION_LEVELS),
+        default="all",
+        help="Optimization level for --ort-optimize; use extended/basic if the "
+        "fully fused graph misbehaves (default: all)",
+    )
+    parser.add_argument(
+        "--force-export",
+        action="store_true",
+        help="Re-export ONNX models even if they are up to date with their sources",
+    )
+    parser.add_argument(
+        "--device",
+        choices=["auto", "cpu", "cuda"],
+        default="auto",
+        help="Device to trace the MiDaS export on; auto uses CUDA when "
+        "available (default: auto)",
+    )
 
     parser.add_argument(
         "--models",
@@ -124,7 +200,59 @@ def parse_args() -> argparse.Namespace:
         help="Comma-separated list of models to process (yolo, midas, depth-anything)",
     )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.int8_calib_dir is not None and not args.int8:
+        parser.error("--int8-calib-dir requires --int8")
+    return args
+
+
+DownloadJob = tuple[Callable[..., Path], dict[str, Any]]
+ExportJob = tuple[Callable[..., Path], dict[str, Any]]
+
+
+def run_exports(jobs: list[ExportJob]) -> list[Path]:
+    """Run ONNX export jobs, in parallel worker processes when there are several.
+
+    The exports are independent and CPU-bound, so they run in separate
+    processes (tracing holds the GIL, and Ultralytics/torch.hub keep
+    module-level state). Unless ONNX_EXPORT_THREADS is set, each worker gets
+    an equal share of the CPU cores.
+    """
+    if len(jobs) <= 1:
+        return [
+            func(**kwargs, num_threads=config.ONNX_EXPORT_THREADS)
+            for func, kwargs in jobs
+        ]
+
+    num_threads = config.ONNX_EXPORT_THREADS or max(
+        1, (os.cpu_count() or 1) // len(jobs)
+    )
+    with ProcessPoolExecutor(
+        max_workers=len(jobs),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        futures = [
+            executor.submit(func, **kwargs, num_threads=num_threads)
+            for func, kwargs in jobs
+        ]
+        return [future.result() for future in as_completed(futures)]
+
+
+def run_downloads(jobs: dict[str, DownloadJob]) -> dict[str, Path]:
+    """Run model downloads concurrently and return their paths by model name.
+
+    Downloads are network-bound, so threads are enough to overlap them; the
+    total time becomes that of the slowest download instead of the sum.
+    """
+    if len(jobs) <= 1:
+        return {name: func(**kwargs) for name, (func, kwargs) in jobs.items()}
+
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = {
+            name: executor.submit(func, **kwargs)
+            for name, (func, kwargs) in jobs.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
 
 
 def main() -> None:
@@ -134,44 +262,33 @@ def main() -> None:
     output_dir.mkdir(parents=True, exist_ok=True)
     
     models_to_process = [m.strip().lower() for m in args.models.split(",")]
-    midas_cache_final = None
+    download_jobs: dict[str, DownloadJob] = {}
+    export_jobs: list[ExportJob] = []
     
     # --- YOLO Processing ---
     if "yolo" in models_to_process:
         # Determine YOLO paths
         # If args.yolo_model is a path, use it. If it's a name, combine with output_dir.
-        if Path(args.yolo_model).is_absolute() or Path(args.yolo_model).parent.name:
+        yolo_model = Path(args.yolo_model)
+        if yolo_model.is_absolute() or yolo_model.parent.name:
              # Provided as path
-             yolo_target = Path(args.yolo_model).resolve()
+             yolo_target = yolo_model.resolve()
         else:
              # Provided as name, save to output_dir
-             yolo_target = output_dir / args.yolo_model
+             yolo_target = output_dir / yolo_model
 
-        logger.info("--- Processing YOLO ---")
-        yolo_final_path = ensure_yolo_model_downloaded(
-            model_name=yolo_target.name,
-            cache_dir=yolo_target.parent,
+        download_jobs["yolo"] = (
+            ensure_yolo_model_downloaded,
+            dict(
+                model_name=yolo_target.name,
+                cache_dir=yolo_target.parent,
+                sha256=args.yolo_sha256,
+                shared_cache_dir=shared_model_cache_dir() if args.shared_cache else None,
+            ),
         )
-        
-        if args.export_onnx:
-            if args.yolo_onnx_output:
-                yolo_onnx_target = args.yolo_onnx_output.resolve()
-            else:
-                yolo_onnx_target = yolo_final_path.with_suffix(".onnx")
-                
-            export_yolo_to_onnx(
-                yolo_path=yolo_final_path,
-                output_path=yolo_onnx_target,
-                opset=args.onnx_opset,
-                imgsz=config.DETECTOR_IMAGE_SIZE,
-                simplify=args.onnx_simplify,
-                half=config.ONNX_HALF_PRECISION,
-            )
 
     # --- MiDaS Processing ---
     if "midas" in models_to_process:
-        logger.info("\n--- Processing MiDaS ---")
-        
         midas_cache = args.midas_cache
         if midas_cache is None:
             # Use config default if available, otherwise defaults to hub cache
@@ -180,33 +297,18 @@ def main() -> None:
                  midas_cache = config.MIDAS_CACHE_DIR
             except Exception:
                  pass
-                 
-        midas_cache_final = ensure_midas_model_available(
-            model_type=args.midas_type,
-            midas_repo=args.midas_repo,
-            cache_dir=midas_cache,
-        )
-        
-        if args.export_onnx:
-            if args.midas_onnx_output:
-                midas_onnx_target = args.midas_onnx_output.resolve()
-            else:
-                midas_onnx_target = output_dir / f"{args.midas_type.lower()}.onnx"
-
-            export_midas_to_onnx(
-                cache_dir=midas_cache_final,
-                output_path=midas_onnx_target,
+
+        download_jobs["midas"] = (
+            ensure_midas_model_available,
+            dict(
                 model_type=args.midas_type,
-                model_repo=args.midas_repo,
-                opset=args.onnx_opset,
-                input_size=config.MIDAS_ONNX_INPUT_SIZE,
-                half=config.ONNX_HALF_PRECISION,
-            )
+                midas_repo=args.midas_repo,
+                cache_dir=midas_cache,
+            ),
+        )
 
     # --- Depth Anything Processing ---
     if "depth-anything" in models_to_process:
-        logger.info("\n--- Processing Depth Anything V2 ---")
-        
         da_model = "depth-anything/Depth-Anything-V2-Small-hf"
         da_cache = None
         try:
@@ -215,11 +317,77 @@ def main() -> None:
         except Exception:
             pass
 
-        ensure_depth_anything_model_available(
-            model_name=da_model,
-            cache_dir=da_cache
+        download_jobs["depth-anything"] = (
+            ensure_depth_anything_model_available,
+            dict(model_name=da_model, cache_dir=da_cache),
+        )
+
+    # --- Download ---
+    logger.info("--- Downloading %s ---", ", ".join(download_jobs))
+    downloaded = run_downloads(download_jobs)
+    yolo_final_path = downloaded.get("yolo")
+    midas_cache_final = downloaded.get("midas")
+
+    if args.export_onnx and yolo_final_path is not None:
+        if args.yolo_onnx_output:
+            yolo_onnx_target = args.yolo_onnx_output.resolve()
+        else:
+            yolo_onnx_target = yolo_final_path.with_suffix(".onnx")
+
+        export_jobs.append(
+            (
+                export_yolo_to_onnx,
+                dict(
+                    yolo_path=yolo_final_path,
+                    output_path=yolo_onnx_target,
+                    opset=args.onnx_opset,
+                    imgsz=config.DETECTOR_IMAGE_SIZE,
+                    simplify=args.onnx_simplify,
+                    half=args.half,
+                    int8=args.int8,
+                    int8_calibration_dir=args.int8_calib_dir,
+                    dynamic=args.dynamic_shape,
+                    dynamic_batch=args.dynamic_batch,
+                    force=args.force_export,
+                    optimize=args.ort_optimize,
+                    optimize_level=args.ort_opt_level,
+                ),
+            )
+        )
+
+    if args.export_onnx and midas_cache_final is not None:
+        if args.midas_onnx_output:
+            midas_onnx_target = args.midas_onnx_output.resolve()
+        else:
+            midas_onnx_target = output_dir / f"{args.midas_type.lower()}.onnx"
+
+        export_jobs.append(
+            (
+                export_midas_to_onnx,
+                dict(
+                    cache_dir=midas_cache_final,
+                    output_path=midas_onnx_target,
+                    model_type=args.midas_type,
+                    model_repo=args.midas_repo,
+                    opset=args.onnx_opset,
+                    input_size=config.MIDAS_ONNX_INPUT_SIZE,
+                    simplify=args.onnx_simplify,
+                    half=args.half,
+                    int8=args.int8,
+                    dynamic=args.dynamic_shape,
+                    dynamic_batch=args.dynamic_batch,
+                    force=args.force_export,
+                    optimize=args.ort_optimize,
+                    optimize_level=args.ort_opt_level,
+                    device=args.device,
+                ),
+            )
         )
 
+    # --- ONNX Export ---
+    if export_jobs:
+        logger.info("\n--- Exporting %d model(s) to ONNX ---", len(export_jobs))
+        run_exports(export_jobs)
 
     logger.info("\n--- Done ---")
     logger.info("Models available at: %s", output_dir)
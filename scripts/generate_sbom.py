@@ -11,19 +11,217 @@ Generates:
 """
 
 import argparse
-import copy
+import base64
 import csv
+import hashlib
+import http.client
 import json
 import re
+import os
+import ssl
 import subprocess
 import sys
+import tempfile
+import threading
+import time
 import tomllib
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from urllib.parse import quote, urlparse
-from urllib.request import urlopen
-from urllib.error import HTTPError, URLError
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import ParseResult, quote, unquote, urljoin, urlparse
+from urllib.error import HTTPError
+from urllib.request import getproxies, proxy_bypass
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PYPROJECT_PATH = PROJECT_ROOT / "src" / "backend" / "pyproject.toml"
+PACKAGE_JSON_PATH = PROJECT_ROOT / "src" / "frontend" / "package.json"
+PACKAGE_LOCK_PATH = PACKAGE_JSON_PATH.parent / "package-lock.json"
+SBOM_PATH = PROJECT_ROOT / "sbom.json"
+CSV_PATH = PROJECT_ROOT / "sbom-dependencies.csv"
+LICENSE_CACHE_PATH = PROJECT_ROOT / ".cache" / "sbom-licenses.json"
+
+# License lookups are network-bound, so they run in parallel
+LICENSE_FETCH_WORKERS = 16
+
+_print_lock = threading.Lock()
+
+HTTP_TIMEOUT = 10
+HTTP_HEADERS = {
+    "Accept": "application/json",
+    "User-Agent": "robot-visual-perception-sbom-generator",
+}
+MAX_REDIRECTS = 3
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+# Repositories per GraphQL query, well below GitHub's node limit
+GITHUB_GRAPHQL_BATCH_SIZE = 50
+
+# Characters that make an npm version a range (covers ">=" and "<=" too)
+_RANGE_CHARS = frozenset("^~><*x")
+_GITHUB_OWNER_REPO_RE = re.compile(r"github\.com/([^/]+)/([^/]+)", re.IGNORECASE)
+
+# pyproject.toml extras whose dependencies are reported as dev dependencies
+DEV_DEPENDENCY_GROUPS = frozenset({"dev", "onnx-tools"})
+
+# Trove classifier levels that do not name a license
+_GENERIC_LICENSE_CLASSIFIERS = frozenset({"OSI Approved", "License"})
+
+# Trove license classifiers that name exactly one SPDX license. Others, like
+# "Apache Software License" or "BSD License", leave the version or variant
+# open and are reported as-is.
+_CLASSIFIER_SPDX_IDS = {
+    "MIT License": "MIT",
+    "MIT No Attribution License (MIT-0)": "MIT-0",
+    "ISC License (ISCL)": "ISC",
+    "Mozilla Public License 2.0 (MPL 2.0)": "MPL-2.0",
+    "Zero-Clause BSD (0BSD)": "0BSD",
+    "The Unlicense (Unlicense)": "Unlicense",
+}
+
+# Columns of the planning document CSV
+CSV_FIELDNAMES = ("#", "Context", "Name", "Version", "License", "Comment")
+
+# SBOM metadata property holding the hash of the dependency manifests
+INPUT_HASH_PROPERTY = "input-hash"
+
+# SPDX ids recognised in full license texts, in priority order: the first
+# rule with a case-insensitive whole-word match anywhere in the text wins.
+# GPL/LGPL mentions without a version have no SPDX id and are not matched.
+_SPDX_RULES = [
+    (re.compile(rf"\b(?:{regex})\b", re.IGNORECASE), spdx)
+    for regex, spdx in [
+        (r"BSD[- ]?3[- ]CLAUSE|3[- ]CLAUSE[- ]BSD", "BSD-3-Clause"),
+        (r"BSD[- ]?2[- ]CLAUSE|2[- ]CLAUSE[- ]BSD", "BSD-2-Clause"),
+        (r"BSD", "BSD-3-Clause"),
+        (r"MIT", "MIT"),
+        (r"APACHE", "Apache-2.0"),
+        (r"GPL-?V?3", "GPL-3.0"),
+        (r"GPL-?V?2", "GPL-2.0"),
+        (r"LGPL-?V?3", "LGPL-3.0"),
+        (r"LGPL-?V?2\.1", "LGPL-2.1"),
+        (r"LGPL-?V?2", "LGPL-2.0"),
+    ]
+]
+
+# PEP 508 requirement pinned to one exact version: name, optional extras,
+# "==" version (including pre/post/dev/local parts) and an optional marker
+_PEP508_EXACT_RE = re.compile(
+    r"^\s*([A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)\s*"
+    r"(?:\[[^\]]*\])?\s*"
+    r"==\s*([A-Za-z0-9.!+_-]+)\s*"
+    r"(?:;.*)?$"
+)
+
+# Bump when the license cache format changes to invalidate old caches
+LICENSE_CACHE_SCHEMA = 1
+NOASSERTION_TTL = 24 * 60 * 60
+# Network failures (OSError covers HTTPError/URLError/timeouts), protocol
+# errors and malformed JSON all fall back to NOASSERTION
+FETCH_ERRORS = (OSError, http.client.HTTPException, ValueError, KeyError)
+
+# One keep-alive connection per host and thread: only three registries are
+# queried, so this saves a TCP+TLS handshake on almost every lookup
+_connections = threading.local()
+# One TLS context (and CA bundle load) shared by all HTTPS connections
+_SSL_CONTEXT = ssl.create_default_context()
+
+
+def _proxy_auth_headers(proxy_url: ParseResult) -> Dict[str, str]:
+    """Basic Proxy-Authorization header for credentials in a proxy URL."""
+    if proxy_url.username is None:
+        return {}
+    credentials = f"{unquote(proxy_url.username)}:{unquote(proxy_url.password or '')}"
+    token = base64.b64encode(credentials.encode()).decode("ascii")
+    return {"Proxy-Authorization": f"Basic {token}"}
+
+
+def _get_connection(scheme: str, host: str) -> http.client.HTTPConnection:
+    pool = _connections.__dict__.setdefault("pool", {})
+    conn = pool.get((scheme, host))
+    if conn is None:
+        conn_class: type[http.client.HTTPConnection] = http.client.HTTPConnection
+        options: Dict[str, Any] = {"timeout": HTTP_TIMEOUT}
+        if scheme == "https":
+            conn_class = http.client.HTTPSConnection
+            options["context"] = _SSL_CONTEXT
+        # Honour HTTP(S)_PROXY and NO_PROXY like urlopen does, tunnelling
+        # through the proxy
+        proxy = getproxies().get(scheme)
+        if proxy and not proxy_bypass(host):
+            proxy_url = urlparse(proxy if "://" in proxy else f"http://{proxy}")
+            proxy_port = proxy_url.port or (443 if proxy_url.scheme == "https" else 80)
+            conn = conn_class(proxy_url.hostname or "", proxy_port, **options)
+            conn.set_tunnel(host, headers=_proxy_auth_headers(proxy_url))
+        else:
+            conn = conn_class(host, **options)
+        pool[(scheme, host)] = conn
+    return conn
+
+
+def _request(
+    url: str, headers: Dict[str, str], body: Optional[bytes] = None
+) -> Tuple[int, http.client.HTTPMessage, bytes]:
+    """GET ``url`` (or POST ``body``) on a pooled connection, retrying once on a stale one."""
+    parsed = urlparse(url)
+    path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+    conn = _get_connection(parsed.scheme, parsed.netloc)
+
+    def send() -> Tuple[int, http.client.HTTPMessage, bytes]:
+        method = "GET" if body is None else "POST"
+        conn.request(method, path, body=body, headers={**HTTP_HEADERS, **headers})
+        response = conn.getresponse()
+        return response.status, response.headers, response.read()
+
+    try:
+        try:
+            return send()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            # The server closed the idle keep-alive connection; reconnect once
+            conn.close()
+            return send()
+    except BaseException:
+        # Never leave a half-finished exchange on the pooled connection
+        conn.close()
+        raise
+
+
+def get_json(url: str, headers: Optional[Dict[str, str]] = None) -> Any:
+    """Fetch and decode a JSON document, following redirects.
+
+    Extra ``headers`` (e.g. credentials) are only sent to the original host.
+    """
+    host = urlparse(url).netloc
+    for _ in range(MAX_REDIRECTS + 1):
+        same_host = urlparse(url).netloc == host
+        status, response_headers, body = _request(
+            url, (headers or {}) if same_host else {}
+        )
+        location = response_headers.get("Location")
+        if status in (301, 302, 303, 307, 308) and location:
+            url = urljoin(url, location)
+            continue
+        if status != 200:
+            reason = http.client.responses.get(status, "")
+            raise HTTPError(url, status, reason, response_headers, None)
+        return json.loads(body)
+    raise HTTPError(url, status, "Too many redirects", response_headers, None)
+
+
+def post_json(url: str, payload: Any, headers: Optional[Dict[str, str]] = None) -> Any:
+    """POST a JSON document and decode the JSON response."""
+    headers = {"Content-Type": "application/json", **(headers or {})}
+    status, response_headers, body = _request(url, headers, json.dumps(payload).encode())
+    if status != 200:
+        reason = http.client.responses.get(status, "")
+        raise HTTPError(url, status, reason, response_headers, None)
+    return json.loads(body)
+
+
+def log_fetch_error(source: str, name: str, error: Exception) -> None:
+    """Print a license fetch error without interleaving with other threads."""
+    with _print_lock:
+        print(f"  {source} fetch error for {name}: {type(error).__name__}", file=sys.stderr)
 
 
 def run_command(cmd: List[str], cwd: Optional[Path] = None) -> str:
@@ -38,14 +236,27 @@ def run_command(cmd: List[str], cwd: Optional[Path] = None) -> str:
         sys.exit(1)
 
 
-def get_project_root() -> Path:
-    """Get project root directory."""
-    return Path(__file__).parent.parent
+def dependency_input_hash(paths: List[Path]) -> str:
+    """Hash the contents of the dependency manifests the SBOM is built from."""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        if path.exists():
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def get_input_hash(sbom: Dict[str, Any]) -> Optional[str]:
+    """Return the input hash recorded in an SBOM, if any."""
+    for prop in sbom.get("metadata", {}).get("properties", []):
+        if prop.get("name") == INPUT_HASH_PROPERTY:
+            return prop.get("value")
+    return None
 
 
 def has_version_range(version: str) -> bool:
     """Check if a version string contains range specifiers."""
-    return any(prefix in version for prefix in ["^", "~", ">", "<", ">=", "<=", "*", "x"])
+    return not _RANGE_CHARS.isdisjoint(version)
 
 
 def get_npm_first_order_deps(package_json_path: Path) -> List[Dict[str, Any]]:
@@ -56,9 +267,15 @@ def get_npm_first_order_deps(package_json_path: Path) -> List[Dict[str, Any]]:
     with open(package_json_path, "r") as f:
         pkg_data = json.load(f)
 
+    # (name, version, is_dev) of production and dev dependencies
+    entries = [
+        (name, version, is_dev)
+        for field, is_dev in (("dependencies", False), ("devDependencies", True))
+        for name, version in pkg_data.get(field, {}).items()
+    ]
+
     # Check if any dependency has version ranges
-    all_deps = {**pkg_data.get("dependencies", {}), **pkg_data.get("devDependencies", {})}
-    has_ranges = any(has_version_range(v) for v in all_deps.values())
+    has_ranges = any(has_version_range(version) for _, version, _ in entries)
 
     # If ranges detected, use package-lock.json
     if has_ranges:
@@ -73,7 +290,7 @@ def get_npm_first_order_deps(package_json_path: Path) -> List[Dict[str, Any]]:
             packages = lock_data.get("packages", {})
 
             resolved_versions = {}
-            for dep_name in all_deps.keys():
+            for dep_name, _, _ in entries:
                 # Look for the package under node_modules/PACKAGE_NAME
                 node_modules_key = f"node_modules/{dep_name}"
                 if node_modules_key in packages:
@@ -86,29 +303,15 @@ def get_npm_first_order_deps(package_json_path: Path) -> List[Dict[str, Any]]:
     else:
         resolved_versions = {}
 
-    deps = []
-
-    # Production dependencies
-    for name, version in pkg_data.get("dependencies", {}).items():
-        resolved_version = resolved_versions.get(name, version)
-        deps.append({
+    return [
+        {
             "name": name,
-            "version": resolved_version,
+            "version": resolved_versions.get(name, version),
             "ecosystem": "npm",
-            "is_dev": False
-        })
-
-    # Dev dependencies
-    for name, version in pkg_data.get("devDependencies", {}).items():
-        resolved_version = resolved_versions.get(name, version)
-        deps.append({
-            "name": name,
-            "version": resolved_version,
-            "ecosystem": "npm",
-            "is_dev": True
-        })
-
-    return deps
+            "is_dev": is_dev
+        }
+        for name, version, is_dev in entries
+    ]
 
 
 def get_python_first_order_deps_from_pyproject(pyproject_path: Path) -> List[Dict[str, Any]]:
@@ -142,14 +345,14 @@ def get_python_first_order_deps_from_pyproject(pyproject_path: Path) -> List[Dic
 
     for source_field, dep_list in dep_strings.items():
         for dep_string in dep_list:
-            match = re.match(r"^([a-zA-Z0-9\-_.]+)\s*==\s*([0-9.]+)", dep_string)
+            match = _PEP508_EXACT_RE.match(dep_string)
             if match:
                 name, version = match.groups()
                 deps.append({
                     "name": name,
                     "version": version,
                     "ecosystem": "pypi",
-                    "is_dev": source_field in ["dev", "onnx-tools"], # Mark dev
+                    "is_dev": source_field in DEV_DEPENDENCY_GROUPS, # Mark dev
                 })
             else:
                 if not dep_string.startswith("#"):
@@ -158,79 +361,188 @@ def get_python_first_order_deps_from_pyproject(pyproject_path: Path) -> List[Dic
     return deps
 
 
+def _npm_manifest_license(url: str) -> Optional[str]:
+    """License declared in an npm version manifest, if any."""
+    license_value = get_json(url).get("license")
+    # Handle different license formats
+    if isinstance(license_value, dict):
+        license_value = license_value.get("type")
+    return license_value if isinstance(license_value, str) and license_value else None
+
+
 def fetch_license_from_npm(name: str, version: str) -> str:
-    """Fetch license from npm registry."""
+    """Fetch license from npm registry.
+
+    Only the manifest of the requested version is downloaded instead of the
+    full package document with every version; the ``latest`` manifest is the
+    fallback when that version is unknown or declares no license.
+    """
     encoded_name = quote(name, safe="@/")
     url = f"https://registry.npmjs.org/{encoded_name}"
 
     try:
-        with urlopen(url, timeout=10) as response:
-            data = json.load(response)
-
-        # Try version-specific license first
-        version_data = data.get("versions", {}).get(version, {})
-        license_value = version_data.get("license")
+        try:
+            license_value = _npm_manifest_license(f"{url}/{quote(version)}")
+        except HTTPError as e:
+            if e.code != 404:
+                raise
+            license_value = None
 
         # Fallback to latest
         if not license_value:
-            license_value = data.get("license")
+            license_value = _npm_manifest_license(f"{url}/latest")
 
-        # Handle different license formats
-        if isinstance(license_value, dict):
-            license_type = license_value.get("type", "NOASSERTION")
-            return license_type if license_type else "NOASSERTION"
-        elif isinstance(license_value, str):
-            return license_value if license_value else "NOASSERTION"
-
-        return "NOASSERTION"
-    except (HTTPError, URLError, TimeoutError, ValueError, KeyError) as e:
-        print(f" (npm fetch error: {type(e).__name__})", end="")
+        return license_value or "NOASSERTION"
+    except FETCH_ERRORS as e:
+        log_fetch_error("npm", name, e)
         return "NOASSERTION"
 
 
-def fetch_license_from_github(repo_url: str) -> str:
-    """Try to fetch license from GitHub repository."""
+def extract_github_owner_repo(repo_url: str) -> Optional[Tuple[str, str]]:
+    """Extract ``(owner, repo)`` from a GitHub URL."""
+    if "github.com" not in urlparse(repo_url).netloc.lower():
+        return None
+    match = _GITHUB_OWNER_REPO_RE.search(repo_url)
+    if not match:
+        return None
+    owner, repo = match.groups()
+    return owner, repo.removesuffix(".git")
 
-    try:
-        # Extract owner/repo from GitHub URL
-        parsed = urlparse(repo_url)
-        if "github.com" not in parsed.netloc.lower():
-            return "NOASSERTION"
-
-        match = re.search(r"github\.com/([^/]+)/([^/]+)", repo_url, re.IGNORECASE)
-        if not match:
-            return "NOASSERTION"
-
-        owner, repo = match.groups()
-        repo = repo.rstrip(".git")
-
-        # Use GitHub API to get license
-        api_url = f"https://api.github.com/repos/{owner}/{repo}"
-        with urlopen(api_url, timeout=10) as response:
-            data = json.load(response)
-            license_data = data.get("license")
-            if license_data and isinstance(license_data, dict):
-                spdx_id = license_data.get("spdx_id")
-                if spdx_id and spdx_id != "NOASSERTION":
-                    return spdx_id
 
-        return "NOASSERTION"
-    except (HTTPError, URLError, TimeoutError, ValueError, KeyError):
+def _github_auth_headers() -> Optional[Dict[str, str]]:
+    # Authenticated requests get 5000 instead of 60 requests per hour
+    token = os.environ.get("GITHUB_TOKEN")
+    return {"Authorization": f"Bearer {token}"} if token else None
+
+
+def _fetch_github_license(owner: str, repo: str) -> str:
+    api_url = f"https://api.github.com/repos/{owner}/{repo}"
+    data = get_json(api_url, _github_auth_headers())
+    license_data = data.get("license")
+    if license_data and isinstance(license_data, dict):
+        spdx_id = license_data.get("spdx_id")
+        if spdx_id and spdx_id != "NOASSERTION":
+            return spdx_id
+    return "NOASSERTION"
+
+
+# Many packages point at the same repository, so each one is queried once,
+# also when several threads ask for it at the same time
+_github_licenses: Dict[Tuple[str, str], "Future[str]"] = {}
+_github_licenses_lock = threading.Lock()
+
+
+def fetch_license_from_github(repo_url: str) -> str:
+    """Try to fetch license from GitHub repository."""
+    owner_repo = extract_github_owner_repo(repo_url)
+    if owner_repo is None:
         return "NOASSERTION"
 
+    key = (owner_repo[0].lower(), owner_repo[1].lower())
+    with _github_licenses_lock:
+        future = _github_licenses.get(key)
+        is_owner = future is None
+        if future is None:
+            future = _github_licenses[key] = Future()
+
+    if is_owner:
+        try:
+            future.set_result(_fetch_github_license(*owner_repo))
+        except FETCH_ERRORS:
+            future.set_result("NOASSERTION")
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+    return future.result()
+
+
+def prefetch_github_licenses(repo_urls: Iterable[str]) -> None:
+    """Look up the licenses of many GitHub repositories in batched GraphQL queries.
+
+    The results are stored where :func:`fetch_license_from_github` finds them,
+    so the following per-package lookups need no further requests.
+    Repositories missing from the response are left to the REST API. GitHub's
+    GraphQL API requires authentication, so nothing happens without
+    ``GITHUB_TOKEN``.
+    """
+    headers = _github_auth_headers()
+    if headers is None:
+        return
 
-def fetch_license_from_pypi(name: str, version: str) -> str:
-    """Fetch license from PyPI."""
+    pending: Dict[Tuple[str, str], Tuple[str, str]] = {}
+    with _github_licenses_lock:
+        for url in repo_urls:
+            owner_repo = extract_github_owner_repo(url)
+            if owner_repo is None:
+                continue
+            key = (owner_repo[0].lower(), owner_repo[1].lower())
+            if key not in _github_licenses:
+                pending.setdefault(key, owner_repo)
+
+    items = list(pending.items())
+    for start in range(0, len(items), GITHUB_GRAPHQL_BATCH_SIZE):
+        batch = items[start:start + GITHUB_GRAPHQL_BATCH_SIZE]
+        fields = " ".join(
+            f"r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) "
+            "{ licenseInfo { spdxId } }"
+            for i, (_, (owner, repo)) in enumerate(batch)
+        )
+        try:
+            data = post_json(GITHUB_GRAPHQL_URL, {"query": f"{{ {fields} }}"}, headers)
+        except FETCH_ERRORS as e:
+            log_fetch_error("github", "graphql batch", e)
+            continue
+
+        # Unknown repositories come back as null next to an "errors" entry
+        repositories = data.get("data") or {}
+        with _github_licenses_lock:
+            for i, (key, _) in enumerate(batch):
+                repository = repositories.get(f"r{i}")
+                if repository is None:
+                    continue
+                spdx_id = (repository.get("licenseInfo") or {}).get("spdxId")
+                future: "Future[str]" = Future()
+                future.set_result(spdx_id or "NOASSERTION")
+                _github_licenses.setdefault(key, future)
+
+
+def fetch_license_from_github_urls(repo_urls: List[str]) -> str:
+    """Return the first license found for any of the repository URLs."""
+    for url in repo_urls:
+        github_license = fetch_license_from_github(url)
+        if github_license != "NOASSERTION":
+            return github_license
+    return "NOASSERTION"
+
+
+def spdx_id_from_license_text(text: str) -> Optional[str]:
+    """Return the SPDX id of the highest-priority license named in a text."""
+    for pattern, spdx_id in _SPDX_RULES:
+        if pattern.search(text):
+            return spdx_id
+    return None
+
+
+def fetch_license_from_pypi(name: str, version: str) -> Tuple[str, List[str]]:
+    """Fetch license from PyPI.
+
+    Returns the license and, if PyPI does not declare one, the project URLs
+    that may point at a GitHub repository to look it up instead.
+    """
     encoded_name = quote(name)
     url = f"https://pypi.org/pypi/{encoded_name}/{version}/json"
 
     try:
-        with urlopen(url, timeout=10) as response:
-            data = json.load(response)
+        data = get_json(url)
 
         info = data.get("info", {})
 
-        # Try license field first
+        # PEP 639 metadata carries a validated SPDX expression
+        license_expression = info.get("license_expression")
+        if license_expression:
+            return license_expression, []
+
+        # Try license field next
         license_field = info.get("license")
         if license_field:
             license_value = str(license_field).strip()
@@ -241,100 +553,201 @@ def fetch_license_from_pypi(name: str, version: str) -> str:
             # Truncate very long licenses (e.g., full license text)
             elif len(license_value) > 100:
                 # Try to extract SPDX identifier from long text
-                upper_text = license_value.upper()
-                if "BSD-3-CLAUSE" in upper_text or ("BSD" in upper_text and "3-CLAUSE" in upper_text):
-                    return "BSD-3-Clause"
-                elif "BSD-2-CLAUSE" in upper_text or ("BSD" in upper_text and "2-CLAUSE" in upper_text):
-                    return "BSD-2-Clause"
-                elif "BSD" in upper_text:
-                    return "BSD-3-Clause"
-                elif "MIT" in upper_text:
-                    return "MIT"
-                elif "APACHE-2.0" in upper_text or "APACHE 2.0" in upper_text:
-                    return "Apache-2.0"
-                elif "APACHE" in upper_text:
-                    return "Apache-2.0"
-                elif "GPL-3" in upper_text or "GPLV3" in upper_text:
-                    return "GPL-3.0"
-                elif "GPL-2" in upper_text or "GPLV2" in upper_text:
-                    return "GPL-2.0"
-                elif "GPL" in upper_text:
-                    return "GPL"
-                elif "LGPL" in upper_text:
-                    return "LGPL"
-                else:
-                    license_value = None
+                spdx_id = spdx_id_from_license_text(license_value)
+                if spdx_id:
+                    return spdx_id, []
+                license_value = None
 
             if license_value:
-                return license_value
+                return license_value, []
 
         # Fallback to classifiers
         classifiers = info.get("classifiers", [])
         for classifier in reversed(classifiers):
             if classifier.startswith("License ::"):
                 parts = [p.strip() for p in classifier.split("::") if p.strip()]
-                if len(parts) > 1 and parts[-1] not in ("OSI Approved", "License"):
+                if len(parts) > 1 and parts[-1] not in _GENERIC_LICENSE_CLASSIFIERS:
                     # Convert common classifier names to SPDX
-                    license_name = parts[-1]
-                    if "MIT" in license_name:
-                        return "MIT"
-                    elif "Apache" in license_name and "2.0" in license_name:
-                        return "Apache-2.0"
-                    elif "BSD" in license_name and "3-Clause" in license_name:
-                        return "BSD-3-Clause"
-                    elif "BSD" in license_name and "2-Clause" in license_name:
-                        return "BSD-2-Clause"
-                    elif "GPL" in license_name:
-                        return license_name
-                    return license_name
-
-        # Last resort: try to get license from project's GitHub repo
-        project_urls = info.get("project_urls", {})
+                    return _CLASSIFIER_SPDX_IDS.get(parts[-1], parts[-1]), []
+
+        # Last resort: the license of the project's GitHub repo
+        repo_urls = []
+        project_urls = info.get("project_urls") or {}
         for url_type, url in project_urls.items():
             if url and ("github.com" in url.lower() or "source" in url_type.lower() or "repository" in url_type.lower()):
-                github_license = fetch_license_from_github(url)
-                if github_license != "NOASSERTION":
-                    return github_license
+                repo_urls.append(url)
 
         # Also check home_page field
         home_page = info.get("home_page")
         if home_page and "github.com" in home_page.lower():
-            github_license = fetch_license_from_github(home_page)
-            if github_license != "NOASSERTION":
-                return github_license
+            repo_urls.append(home_page)
 
-        return "NOASSERTION"
-    except (HTTPError, URLError, TimeoutError, ValueError, KeyError) as e:
-        print(f" (pypi fetch error: {type(e).__name__})", end="")
-        return "NOASSERTION"
+        return "NOASSERTION", repo_urls
+    except FETCH_ERRORS as e:
+        log_fetch_error("pypi", name, e)
+        return "NOASSERTION", []
 
 
-def enrich_with_licenses(deps: List[Dict[str, Any]]) -> None:
-    """Enrich dependencies with license information."""
-    for dep in deps:
-        ecosystem = dep["ecosystem"]
-        name = dep["name"]
-        version = dep["version"]
+def fetch_license(dep: Dict[str, Any]) -> Tuple[str, List[str]]:
+    """Fetch the license of a single dependency from its registry.
+
+    Returns the license and the repository URLs to try on GitHub if the
+    registry has none.
+    """
+    if dep["ecosystem"] == "npm":
+        return fetch_license_from_npm(dep["name"], dep["version"]), []
+    elif dep["ecosystem"] == "pypi":
+        return fetch_license_from_pypi(dep["name"], dep["version"])
+    return "NOASSERTION", []
+
+
+def license_cache_key(dep: Dict[str, Any]) -> Optional[str]:
+    """Cache key of a dependency, or None if its version is not pinned."""
+    if has_version_range(dep["version"]):
+        return None
+    return f"{dep['ecosystem']}:{dep['name']}@{dep['version']}"
+
+
+def component_purl(dep: Dict[str, Any]) -> Optional[str]:
+    """Package URL of a dependency, or None for unknown ecosystems."""
+    if dep["ecosystem"] in ("npm", "pypi"):
+        return f"pkg:{dep['ecosystem']}/{dep['name']}@{dep['version']}"
+    return None
 
-        print(f"  Fetching license for {name}@{version}...", end="")
 
-        if ecosystem == "npm":
-            dep["license"] = fetch_license_from_npm(name, version)
-        elif ecosystem == "pypi":
-            dep["license"] = fetch_license_from_pypi(name, version)
+def licenses_from_sbom(sbom: Dict[str, Any]) -> Dict[str, str]:
+    """Map component purls of a previous SBOM to their license ids."""
+    licenses = {}
+    for component in sbom.get("components", []):
+        purl = component.get("purl")
+        license_id = (component.get("licenses") or [{}])[0].get("license", {}).get("id")
+        if purl and license_id:
+            licenses[purl] = license_id
+    return licenses
+
+
+def load_license_cache(cache_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Load cached licenses, ignoring missing, corrupt or outdated caches."""
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("_schema") != LICENSE_CACHE_SCHEMA:
+        return {}
+    return data.get("licenses", {})
+
+
+def save_license_cache(cache_path: Path, licenses: Dict[str, Dict[str, Any]]) -> None:
+    """Write the license cache atomically."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"_schema": LICENSE_CACHE_SCHEMA, "licenses": licenses}
+    fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def get_cached_license(entry: Optional[Dict[str, Any]], now: float) -> Optional[str]:
+    """Return a cached license unless it is missing or an expired NOASSERTION."""
+    if not entry:
+        return None
+    license_value = entry.get("license")
+    if license_value == "NOASSERTION":
+        # Likely a transient fetch error, so it is retried after a while
+        if now - entry.get("fetched_at", 0) > NOASSERTION_TTL:
+            return None
+    return license_value
+
+
+def enrich_with_licenses(
+    deps: List[Dict[str, Any]],
+    cache_path: Optional[Path] = None,
+    previous_licenses: Optional[Dict[str, str]] = None,
+) -> None:
+    """Enrich dependencies with license information.
+
+    The license of a pinned ``(ecosystem, name, version)`` never changes, so
+    results are cached in ``cache_path`` and only cache misses hit the
+    registries. Known licenses of the previous SBOM (``previous_licenses``,
+    keyed by purl) are reused the same way. A package listed several times
+    (e.g. in more than one extra) is looked up once. The lookups run in a
+    thread pool; results are printed in completion order, while the dependency
+    order itself is left unchanged.
+    """
+    cache = load_license_cache(cache_path) if cache_path else {}
+    previous_licenses = previous_licenses or {}
+    now = time.time()
+
+    # Dependencies to look up, grouped by (ecosystem, name, version)
+    to_fetch: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+    for dep in deps:
+        key = license_cache_key(dep)
+        cached = None
+        if key:
+            cached = get_cached_license(cache.get(key), now)
+            purl = component_purl(dep)
+            if cached is None and purl:
+                cached = previous_licenses.get(purl)
+        if cached is not None:
+            dep["license"] = cached
         else:
-            dep["license"] = "NOASSERTION"
+            to_fetch.setdefault((dep["ecosystem"], dep["name"], dep["version"]), []).append(dep)
+    if cache_path or previous_licenses:
+        cached_count = len(deps) - sum(len(same) for same in to_fetch.values())
+        print(f"  {cached_count} licenses from cache, fetching {len(to_fetch)}")
+
+    def set_license(same_deps: List[Dict[str, Any]], license_value: str) -> None:
+        for dep in same_deps:
+            dep["license"] = license_value
+        dep = same_deps[0]
+        with _print_lock:
+            print(f"  {dep['name']}@{dep['version']}: {license_value}")
+        key = license_cache_key(dep)
+        if key:
+            cache[key] = {"license": license_value, "fetched_at": now}
+
+    with ThreadPoolExecutor(max_workers=LICENSE_FETCH_WORKERS) as executor:
+        github_fallbacks: List[Tuple[List[Dict[str, Any]], List[str]]] = []
+        futures: Dict["Future[Tuple[str, List[str]]]", List[Dict[str, Any]]] = {
+            executor.submit(fetch_license, same_deps[0]): same_deps
+            for same_deps in to_fetch.values()
+        }
+        for future in as_completed(futures):
+            same_deps = futures[future]
+            license_value, repo_urls = future.result()
+            if license_value == "NOASSERTION" and repo_urls:
+                github_fallbacks.append((same_deps, repo_urls))
+            else:
+                set_license(same_deps, license_value)
+
+        # Resolve the GitHub fallbacks together, so they can share few requests
+        if github_fallbacks:
+            prefetch_github_licenses(url for _, urls in github_fallbacks for url in urls)
+            github_futures: Dict["Future[str]", List[Dict[str, Any]]] = {
+                executor.submit(fetch_license_from_github_urls, urls): same_deps
+                for same_deps, urls in github_fallbacks
+            }
+            for github_future in as_completed(github_futures):
+                set_license(github_futures[github_future], github_future.result())
 
-        print(f" {dep['license']}")
+    if cache_path and to_fetch:
+        save_license_cache(cache_path, cache)
 
 
 def generate_cyclonedx_sbom(
-    all_deps: List[Dict[str, Any]], timestamp: Optional[str] = None
+    all_deps: List[Dict[str, Any]],
+    timestamp: Optional[str] = None,
+    input_hash: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Generate CycloneDX SBOM."""
-    sbom_timestamp = timestamp or datetime.utcnow().isoformat() + "Z"
+    sbom_timestamp = timestamp or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    sbom = {
+    sbom: Dict[str, Any] = {
         "bomFormat": "CycloneDX",
         "specVersion": "1.6",
         "version": 1,
@@ -352,6 +765,10 @@ def generate_cyclonedx_sbom(
         },
         "components": []
     }
+    if input_hash:
+        sbom["metadata"]["properties"] = [
+            {"name": INPUT_HASH_PROPERTY, "value": input_hash}
+        ]
 
     for dep in all_deps:
         component = {
@@ -361,10 +778,9 @@ def generate_cyclonedx_sbom(
         }
 
         # Add PURL
-        if dep["ecosystem"] == "npm":
-            component["purl"] = f"pkg:npm/{dep['name']}@{dep['version']}"
-        elif dep["ecosystem"] == "pypi":
-            component["purl"] = f"pkg:pypi/{dep['name']}@{dep['version']}"
+        purl = component_purl(dep)
+        if purl:
+            component["purl"] = purl
 
         # Add license if available
         if dep.get("license") and dep["license"] != "NOASSERTION":
@@ -379,9 +795,9 @@ def generate_cyclonedx_sbom(
     return sbom
 
 
-def generate_csv_for_planning_doc(all_deps: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+def generate_csv_for_planning_doc(all_deps: List[Dict[str, Any]]) -> List[Tuple[str, ...]]:
     """Generate CSV data matching the planning document format."""
-    csv_data = []
+    csv_data: List[Tuple[str, ...]] = []
 
     # Context mapping
     def get_context(dep: Dict[str, Any]) -> str:
@@ -413,25 +829,24 @@ def generate_csv_for_planning_doc(all_deps: List[Dict[str, Any]]) -> List[Dict[s
         else:
             formatted_name = dep["name"]
 
-        csv_data.append({
-            "#": str(idx),
-            "Context": context,
-            "Name": formatted_name,
-            "Version": dep["version"],
-            "License": dep.get("license", "NOASSERTION"),
-            "Comment": ""  # Empty for automated entries
-        })
+        # Row in CSV_FIELDNAMES order
+        csv_data.append((
+            str(idx),
+            context,
+            formatted_name,
+            dep["version"],
+            dep.get("license", "NOASSERTION"),
+            "",  # Comment, empty for automated entries
+        ))
 
     return csv_data
 
 
-def write_csv(csv_data: List[Dict[str, str]], output_path: Path) -> None:
+def write_csv(csv_data: List[Tuple[str, ...]], output_path: Path) -> None:
     """Write CSV file."""
-    fieldnames = ["#", "Context", "Name", "Version", "License", "Comment"]
-
     with open(output_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator="\n")
-        writer.writeheader()
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(CSV_FIELDNAMES)
         writer.writerows(csv_data)
 
 
@@ -447,13 +862,21 @@ def load_existing_sbom(sbom_path: Path) -> Optional[Dict[str, Any]]:
         return None
 
 
-def normalize_sbom(sbom: Dict[str, Any]) -> Dict[str, Any]:
-    """Return a SBOM copy with volatile metadata removed for comparison."""
-    data = copy.deepcopy(sbom)
-    metadata = data.get("metadata")
-    if isinstance(metadata, dict):
-        metadata.pop("timestamp", None)
-    return data
+def keep_previous_timestamp(sbom: Dict[str, Any], existing_sbom: Dict[str, Any]) -> None:
+    """Reuse the previous SBOM timestamp if nothing else changed.
+
+    The new timestamp is swapped out in place for the comparison instead of
+    deep-copying both documents; assigning to the existing key keeps the
+    metadata key order intact.
+    """
+    previous_timestamp = existing_sbom.get("metadata", {}).get("timestamp")
+    if not previous_timestamp:
+        return
+    metadata = sbom["metadata"]
+    new_timestamp = metadata["timestamp"]
+    metadata["timestamp"] = previous_timestamp
+    if sbom != existing_sbom:
+        metadata["timestamp"] = new_timestamp
 
 
 def main():
@@ -463,12 +886,18 @@ def main():
         action="store_true",
         help="Check if SBOM files are up-to-date (exit 1 if not)",
     )
+    parser.add_argument(
+        "--no-license-cache",
+        action="store_true",
+        help="Fetch all licenses again instead of reusing the cache and the existing sbom.json",
+    )
     args = parser.parse_args()
 
-    root = get_project_root()
-    sbom_path = root / "sbom.json"
-    csv_path = root / "sbom-dependencies.csv"
+    sbom_path = SBOM_PATH
+    csv_path = CSV_PATH
     existing_sbom = load_existing_sbom(sbom_path)
+    dependency_files = [PYPROJECT_PATH, PACKAGE_JSON_PATH, PACKAGE_LOCK_PATH]
+    input_hash = dependency_input_hash(dependency_files)
 
     # Check mode
     if args.check:
@@ -476,12 +905,17 @@ def main():
             print("Error: SBOM files missing. Run 'make sbom' to generate.")
             sys.exit(1)
 
-        # Check if dependency files are newer than SBOM
-        dependency_files = [
-            root / "src" / "backend" / "pyproject.toml",
-            root / "src" / "frontend" / "package.json",
-        ]
-
+        # Compare against the input hash recorded in the SBOM, which is not
+        # fooled by touched files or fresh checkouts
+        recorded_hash = get_input_hash(existing_sbom) if existing_sbom else None
+        if recorded_hash:
+            if recorded_hash != input_hash:
+                print("Error: Dependencies changed but SBOM not updated. Run 'make sbom'.")
+                sys.exit(1)
+            print("SBOM is up-to-date.")
+            return
+
+        # Older SBOMs without a hash: check if dependency files are newer
         existing_mtimes = [
             path.stat().st_mtime for path in dependency_files if path.exists()
         ]
@@ -505,13 +939,12 @@ def main():
     all_deps = []
 
     # Frontend dependencies
-    frontend_deps = get_npm_first_order_deps(root / "src" / "frontend" / "package.json")
+    frontend_deps = get_npm_first_order_deps(PACKAGE_JSON_PATH)
     all_deps.extend(frontend_deps)
     print(f"Found {len(frontend_deps)} frontend dependencies")
 
     # Backend dependencies (core + all extras)
-    pyproject_path = root / "src" / "backend" / "pyproject.toml"    
-    backend_deps = get_python_first_order_deps_from_pyproject(pyproject_path)
+    backend_deps = get_python_first_order_deps_from_pyproject(PYPROJECT_PATH)
     all_deps.extend(backend_deps)
     prod_count = sum(1 for d in backend_deps if not d["is_dev"])
     dev_count = sum(1 for d in backend_deps if d["is_dev"])
@@ -522,19 +955,18 @@ def main():
 
     # Enrich with license information
     print("\nFetching license information...")
-    enrich_with_licenses(all_deps)
+    if args.no_license_cache:
+        enrich_with_licenses(all_deps)
+    else:
+        previous_licenses = licenses_from_sbom(existing_sbom) if existing_sbom else None
+        enrich_with_licenses(all_deps, LICENSE_CACHE_PATH, previous_licenses)
 
     # Generate SBOM
     print("\nGenerating CycloneDX SBOM...")
-    sbom = generate_cyclonedx_sbom(all_deps)
+    sbom = generate_cyclonedx_sbom(all_deps, input_hash=input_hash)
 
     if existing_sbom:
-        previous_timestamp = existing_sbom.get("metadata", {}).get("timestamp")
-        if previous_timestamp:
-            new_normalized = normalize_sbom(sbom)
-            existing_normalized = normalize_sbom(existing_sbom)
-            if new_normalized == existing_normalized:
-                sbom["metadata"]["timestamp"] = previous_timestamp
+        keep_previous_timestamp(sbom, existing_sbom)
 
     with open(sbom_path, "w") as f:
         json.dump(sbom, f, indent=2)
@@ -12,6 +12,20 @@ class Config:
 
     # Camera settings
     CAMERA_INDEX: int = int(os.getenv("CAMERA_INDEX", "0"))
+    # OpenCV capture backend to try first (e.g. MSMF, V4L2, GSTREAMER); empty
+    # uses the platform defaults
+    CAMERA_BACKEND: str = os.getenv("CAMERA_BACKEND", "").strip().upper()
+    # FOURCC requested from the camera driver (e.g. MJPG, YUY2); empty keeps
+    # the driver default. YUY2/YUYV frames are streamed without BGR conversion.
+    CAMERA_FOURCC: str = os.getenv("CAMERA_FOURCC", "").strip().upper()
+    # Open the camera when the streamer starts instead of on the first /offer
+    CAMERA_PREWARM: bool = os.getenv("CAMERA_PREWARM", "true").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    # CPU to pin the camera reader thread to (Linux only); -1 disables pinning
+    CAMERA_READER_CPU: int = int(os.getenv("CAMERA_READER_CPU", "-1"))
 
     REGION_SIZE = int(
         os.getenv("REGION_SIZE", "5")
@@ -116,6 +130,8 @@ class Config:
         "true",
         "yes",
     )
+    # Intra-op threads for torch/MKL/OpenMP during ONNX export; 0 = min(8, CPUs)
+    ONNX_EXPORT_THREADS: int = int(os.getenv("ONNX_EXPORT_THREADS", "0"))
     ONNX_PROVIDERS: list[str] = [
         provider.strip()
         for provider in os.getenv("ONNX_PROVIDERS", "").split(",")
@@ -3,13 +3,21 @@
 # SPDX-License-Identifier: MIT
 import asyncio
 import contextlib
+import logging
+import os
+import threading
 from typing import Optional
 
 import cv2
 import numpy as np
 
 from common.config import config
-from common.utils.camera import open_camera, read_frame
+from common.utils.camera import configure_pixel_format, open_camera, read_frame
+
+logger = logging.getLogger(__name__)
+
+# How long release() waits for the reader thread to leave cap.read() (seconds)
+READER_JOIN_TIMEOUT = 1.0
 
 
 class _SharedCamera:
@@ -17,32 +25,53 @@ class _SharedCamera:
         """Initialize shared camera state.
 
         Sets up internal variables including the reference counter, asyncio lock,
-        capture handle, current frame buffer, running flag, and background reader task.
+        capture handle, current frame buffer, running flag, the background
+        reader thread, and the per-consumer frame queues.
         """
         self._refcount = 0
         self._lock = asyncio.Lock()
         self._cap: Optional[cv2.VideoCapture] = None
         self._frame: Optional[np.ndarray] = None
+        self._pixel_format = "bgr24"
+        self._subscribers: list[
+            tuple[asyncio.AbstractEventLoop, asyncio.Queue[np.ndarray]]
+        ] = []
+        self._subscribers_lock = threading.Lock()
         self._running = False
-        self._reader_task: Optional[asyncio.Task] = None
+        self._reader_thread: Optional[threading.Thread] = None
+        self._reader_stop: Optional[threading.Event] = None
 
     async def acquire(self) -> None:
         """Acquire access to the shared camera.
 
         Increments the reference count and, if this is the first caller,
-        opens the camera at the configured index and starts an asynchronous
-        background task to continuously read frames without blocking the
-        event loop.
+        opens the camera at the configured index and backend, requests the
+        configured capture format, and starts a dedicated reader thread so blocking
+        capture calls never run on the event loop.
         """
         async with self._lock:
             if self._cap is None:
                 try:
-                    self._cap = open_camera(config.CAMERA_INDEX)
+                    self._cap = open_camera(config.CAMERA_INDEX, config.CAMERA_BACKEND)
+                    self._pixel_format = configure_pixel_format(
+                        self._cap, config.CAMERA_FOURCC
+                    )
                     self._running = True
-                    self._reader_task = asyncio.create_task(self._read_loop())
+                    self._reader_stop = threading.Event()
+                    self._reader_thread = threading.Thread(
+                        target=self._read_loop,
+                        args=(self._cap, self._reader_stop),
+                        name="shared-camera-reader",
+                        daemon=True,
+                    )
+                    self._reader_thread.start()
                     self._refcount = 1  # first successful user
                 except Exception:
-                    # no leaked +1
+                    # no leaked +1 and no leaked capture handle
+                    if self._cap is not None:
+                        self._cap.release()
+                        self._cap = None
+                    self._running = False
                     self._refcount = max(0, self._refcount - 1)
                     raise
             else:
@@ -52,41 +81,117 @@ class _SharedCamera:
         """Release access to the shared camera.
 
         Decrements the reference count and, when no users remain,
-        stops the frame reading loop, cancels the background task,
-        releases the camera resource, and resets all internal state.
+        stops the reader thread, releases the camera resource, and resets all internal state.
+        The capture is released by the reader thread itself once it leaves its
+        loop, so a thread still blocked in cap.read() after the join timeout
+        never reads from a released capture.
         """
         async with self._lock:
             self._refcount = max(0, self._refcount - 1)
             if self._refcount <= 0:
                 self._running = False
-                if self._reader_task:
-                    self._reader_task.cancel()
-                    with contextlib.suppress(Exception):
-                        await self._reader_task
-                if self._cap is not None:
+                thread = self._reader_thread
+                if self._reader_stop is not None:
+                    self._reader_stop.set()
+                if thread is not None:
+                    # The thread may be blocked in cap.read() for one frame
+                    # interval; join it off the event loop.
+                    await asyncio.get_running_loop().run_in_executor(
+                        None, thread.join, READER_JOIN_TIMEOUT
+                    )
+                    if thread.is_alive():
+                        logger.warning(
+                            "Camera reader still blocked after %.1f s; it releases "
+                            "the camera when the read returns",
+                            READER_JOIN_TIMEOUT,
+                        )
+                elif self._cap is not None:
                     self._cap.release()
-                    self._cap = None
+                self._cap = None
                 self._frame = None
-                self._reader_task = None
+                self._reader_thread = None
+                self._reader_stop = None
                 self._refcount = 0
 
-    async def _read_loop(self) -> None:
-        """Continuously read frames in a background task.
+    def _read_loop(self, cap: cv2.VideoCapture, stop: threading.Event) -> None:
+        """Continuously read frames on the reader thread.
 
-        Uses a thread executor to avoid blocking the event loop. On failed reads,
-        waits briefly (~30 ms) to prevent busy-waiting and allow the camera to recover.
-        Stops gracefully when cancelled or the camera is released.
+        Publishes every successful read to all subscribed queues. On failed
+        reads, waits briefly (~30 ms) to prevent busy-waiting and allow the camera
+        to recover. Stops once ``stop`` is set and then releases ``cap``, which
+        this thread owns.
         """
-        loop = asyncio.get_running_loop()
+        _pin_current_thread(config.CAMERA_READER_CPU)
         try:
-            while self._running and self._cap:
-                ok, frame = await loop.run_in_executor(None, read_frame, self._cap)
-                if ok:
+            while not stop.is_set():
+                ok, frame = read_frame(cap)
+                if stop.is_set():
+                    # released while blocked in read(): do not publish
+                    break
+                if ok and frame is not None and self._pixel_format == "yuyv422":
+                    # None if the buffer does not match the advertised format
+                    frame = self._as_yuyv422(cap, frame)
+                if ok and frame is not None:
                     self._frame = frame
+                    with self._subscribers_lock:
+                        subscribers = list(self._subscribers)
+                    for loop, queue in subscribers:
+                        # loop may already be closed during shutdown
+                        with contextlib.suppress(RuntimeError):
+                            loop.call_soon_threadsafe(_put_latest, queue, frame)
                 else:
-                    await asyncio.sleep(0.03)
-        except asyncio.CancelledError:
-            pass
+                    stop.wait(0.03)
+        finally:
+            cap.release()
+
+    def _as_yuyv422(
+        self, cap: cv2.VideoCapture, frame: np.ndarray
+    ) -> Optional[np.ndarray]:
+        """Reshape a raw YUYV buffer to (H, W, 2).
+
+        Falls back to BGR output if the backend does not deliver a packed
+        YUYV buffer matching the negotiated frame size. The mismatching buffer
+        is dropped (None) since it is neither YUYV nor a BGR image.
+        """
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if frame.size == width * height * 2:
+            return frame.reshape(height, width, 2)
+        logger.warning(
+            "Camera did not deliver raw YUYV frames, falling back to BGR capture"
+        )
+        cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+        self._pixel_format = "bgr24"
+        return None
+
+    def subscribe(self) -> asyncio.Queue[np.ndarray]:
+        """Register a consumer and return its frame queue.
+
+        The queue holds at most one frame: when the consumer falls behind, the
+        stale frame is replaced by the newest one instead of building up
+        latency. Must be called from the event loop that consumes the queue.
+
+        Returns:
+            asyncio.Queue[np.ndarray]: Queue receiving every newly captured frame.
+        """
+        queue: asyncio.Queue[np.ndarray] = asyncio.Queue(maxsize=1)
+        if self._frame is not None:
+            queue.put_nowait(self._frame)
+        with self._subscribers_lock:
+            self._subscribers.append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[np.ndarray]) -> None:
+        """Stop delivering frames to a queue returned by subscribe()."""
+        with self._subscribers_lock:
+            self._subscribers = [
+                entry for entry in self._subscribers if entry[1] is not queue
+            ]
+
+    @property
+    def pixel_format(self) -> str:
+        """PyAV pixel format of the published frames ("bgr24" or "yuyv422")."""
+        return self._pixel_format
 
     def latest(self) -> Optional[np.ndarray]:
         """Return the most recently captured frame.
@@ -98,4 +203,26 @@ class _SharedCamera:
         return self._frame
 
 
+def _pin_current_thread(cpu: int) -> None:
+    """Pin the calling thread to one CPU to avoid migration jitter.
+
+    No-op for a negative ``cpu`` or on platforms without sched_setaffinity.
+    """
+    if cpu < 0 or not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        # pid 0 targets the calling thread on Linux
+        os.sched_setaffinity(0, {cpu})
+    except OSError as e:
+        logger.warning("Could not pin camera reader to CPU %d: %s", cpu, e)
+
+
+def _put_latest(queue: asyncio.Queue[np.ndarray], frame: np.ndarray) -> None:
+    """Put a frame into a size-1 queue, dropping the stale one if present."""
+    if queue.full():
+        with contextlib.suppress(asyncio.QueueEmpty):
+            queue.get_nowait()
+    queue.put_nowait(frame)
+
+
 _shared_cam = _SharedCamera()
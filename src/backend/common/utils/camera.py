@@ -9,20 +9,27 @@ import cv2
 import numpy as np
 
 
-def open_camera(idx: int) -> cv2.VideoCapture:
+def open_camera(idx: int, preferred_backend: str = "") -> cv2.VideoCapture:
     """Open a webcam using platform-appropriate OpenCV backends.
 
     Tries multiple backends depending on the operating system (e.g., DirectShow
-    on Windows, AVFoundation on macOS, V4L2 on Linux). Returns the first
-    successfully opened camera. Raises an error if no backend succeeds.
+    on Windows, AVFoundation on macOS, V4L2 on Linux), preceded by an
+    explicitly requested backend if given. Returns the first successfully
+    opened camera with the driver queue limited to a single buffer, so reads
+    return the newest frame instead of a backlog. Raises an error if no
+    backend succeeds.
 
     Args:
         idx (int): The index of the camera to open.
+        preferred_backend (str): Optional OpenCV backend name to try first
+            (e.g. "MSMF", "V4L2", "GSTREAMER"); empty uses the platform
+            defaults only.
 
     Returns:
         cv2.VideoCapture: An opened OpenCV VideoCapture object ready for frame reads.
 
     Raises:
+        ValueError: If the requested backend is unknown to OpenCV.
         RuntimeError: If the camera cannot be opened with any backend.
     """
     backends: list[int] = []
@@ -33,6 +40,12 @@ def open_camera(idx: int) -> cv2.VideoCapture:
     else:
         backends = [cv2.CAP_V4L2, cv2.CAP_ANY]
 
+    if preferred_backend:
+        preferred = getattr(cv2, f"CAP_{preferred_backend.upper()}", None)
+        if preferred is None:
+            raise ValueError(f"Unknown OpenCV capture backend: {preferred_backend}")
+        backends = [preferred] + [b for b in backends if b != preferred]
+
     last_error: Optional[str] = None
     for backend in backends:
         cap = (
@@ -41,6 +54,8 @@ def open_camera(idx: int) -> cv2.VideoCapture:
             else cv2.VideoCapture(idx)
         )
         if cap.isOpened():
+            # ignored by backends without a driver-side queue
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             return cap
         cap.release()
         last_error = f"backend={backend}"
@@ -53,9 +68,11 @@ def open_camera(idx: int) -> cv2.VideoCapture:
 
 
 def read_frame(cap: cv2.VideoCapture) -> tuple[bool, Optional[np.ndarray]]:
-    """Read a single frame from the camera in a separate thread.
+    """Read a single frame from the camera.
 
-    Used with run_in_executor to avoid blocking the asyncio event loop.
+    Blocks until the next frame arrives. Only called from the dedicated reader
+    thread of ``_SharedCamera`` (``common.core.camera``), which owns ``cap``;
+    the asyncio event loop never reads frames itself.
 
     Args:
         cap (cv2.VideoCapture): The opened camera capture object.
@@ -67,6 +84,59 @@ def read_frame(cap: cv2.VideoCapture) -> tuple[bool, Optional[np.ndarray]]:
     return cap.read()
 
 
+def configure_pixel_format(cap: cv2.VideoCapture, fourcc: str) -> str:
+    """Request a capture FOURCC and return the pixel format of the read frames.
+
+    For packed YUV 4:2:2 (YUY2/YUYV) OpenCV's implicit BGR conversion is
+    disabled so frames can be handed to the encoder as-is. Other FOURCCs
+    (e.g. MJPG) are decoded to BGR by OpenCV.
+
+    Args:
+        cap (cv2.VideoCapture): The opened camera capture object.
+        fourcc (str): Four character code to request, or an empty string to
+            keep the driver default.
+
+    Returns:
+        str: The PyAV pixel format of frames returned by read_frame, either
+        "bgr24" or "yuyv422".
+    """
+    if len(fourcc) != 4:
+        return "bgr24"
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter.fourcc(*fourcc))
+    if fourcc in ("YUY2", "YUYV") and cap.set(cv2.CAP_PROP_CONVERT_RGB, 0):
+        return "yuyv422"
+    return "bgr24"
+
+
+def mirror_frame(
+    frame: np.ndarray, pixel_format: str, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Flip a frame horizontally.
+
+    Args:
+        frame (np.ndarray): Frame as (H, W, 3) BGR or (H, W, 2) packed YUYV.
+        pixel_format (str): "bgr24" or "yuyv422".
+        out (Optional[np.ndarray]): Destination of the frame's shape to write
+            into instead of allocating, e.g. a view of a VideoFrame plane.
+            Rows may be padded (row stride larger than the row size).
+
+    Returns:
+        np.ndarray: The horizontally mirrored frame (``out`` if given,
+        otherwise a new contiguous array).
+    """
+    if pixel_format == "yuyv422":
+        # Two pixels share one Y0 U Y1 V macro-pixel: reverse the macro-pixels
+        # and swap the two luma samples inside each of them.
+        h, w = frame.shape[:2]
+        macro = frame.reshape(h, w // 2, 4)[:, ::-1]
+        if out is None:
+            return macro[..., [2, 1, 0, 3]].reshape(h, w, 2)
+        # mode="clip" writes straight into `out` instead of a temporary buffer
+        np.take(macro, [2, 1, 0, 3], axis=2, out=out.reshape(h, w // 2, 4), mode="clip")
+        return out
+    return cv2.flip(frame, 1, dst=out)
+
+
 def compute_camera_intrinsics(
     width: int,
     height: int,
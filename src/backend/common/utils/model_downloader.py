@@ -3,38 +3,57 @@
 # SPDX-License-Identifier: MIT
 """Model management module for downloading and exporting ML models."""
 
+import hashlib
+import importlib
+import json
 import logging
+import os
 import shutil
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterable, Optional
 
-import torch
-from ultralytics import YOLO  # type: ignore[import-untyped]
+import cv2
+import numpy as np
 
-try:
-    from transformers import (  # type: ignore[import-untyped]
-        AutoImageProcessor,
-        AutoModelForDepthEstimation,
-    )
-except ImportError:
-    AutoImageProcessor = None  # type: ignore
-    AutoModelForDepthEstimation = None  # type: ignore
+from common.utils.transforms import letterbox
 
-try:
-    import onnx
-except ImportError:
-    onnx = None  # type: ignore
+logger = logging.getLogger(__name__)
 
-try:
-    from onnxruntime.transformers.float16 import convert_float_to_float16  # type: ignore[import-untyped]
+# torch and ultralytics take seconds to import, so they are loaded on first
+# use: download-only runs with cached models never need them.
+torch: Any = None
+YOLO: Any = None
 
-    HAS_ONNX_QUANTIZATION = True
-except ImportError:
-    convert_float_to_float16 = None  # type: ignore
-    HAS_ONNX_QUANTIZATION = False
 
+def _get_torch() -> Any:
+    global torch
+    if torch is None:
+        import torch as torch_module
 
-logger = logging.getLogger(__name__)
+        torch = torch_module
+    return torch
+
+
+def _get_yolo_class() -> Any:
+    global YOLO
+    if YOLO is None:
+        from ultralytics import YOLO as yolo_class  # type: ignore[import-untyped]
+
+        YOLO = yolo_class
+    return YOLO
+
+
+def _import_optional(module_name: str) -> Any:
+    """Import an optional dependency on first use, or return None if missing.
+
+    onnx, onnxruntime and transformers are only needed by some code paths;
+    ``onnxruntime.quantization`` alone pulls in torch and sympy. Importing
+    them lazily keeps ``--help`` and download-only runs fast.
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        return None
 
 
 # Constants
@@ -43,21 +62,73 @@ DEFAULT_MIDAS_REPO = "intel-isl/MiDaS"
 PYTORCH_HUB_CACHE = Path.home() / ".cache" / "torch" / "hub"
 
 
+def shared_model_cache_dir() -> Path:
+    """Per-user cache that downloaded weights are shared through.
+
+    Lets several checkouts, output directories and CI jobs on one host reuse
+    a single download instead of fetching the same weights again.
+    """
+    xdg_cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(xdg_cache) / "robot-visual-perception" / "models"
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Hardlink ``source`` to ``target``, copying across filesystems."""
+    target.unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def _sha256sum(path: Path) -> str:
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _checksum_path(model_path: Path) -> Path:
+    return model_path.with_name(model_path.name + ".sha256")
+
+
+def _is_cached_model_valid(model_path: Path, sha256: Optional[str]) -> bool:
+    """Check a cached model against the expected or recorded SHA-256.
+
+    Models without a known checksum (e.g. placed there by hand) are trusted.
+    """
+    expected = sha256
+    checksum_path = _checksum_path(model_path)
+    if expected is None and checksum_path.exists():
+        expected = checksum_path.read_text().strip()
+    return expected is None or _sha256sum(model_path) == expected
+
+
 def ensure_yolo_model_downloaded(
     model_name: str = "yolo11n.pt",
     cache_dir: Optional[Path] = None,
+    sha256: Optional[str] = None,
+    shared_cache_dir: Optional[Path] = None,
 ) -> Path:
     """Ensure YOLO model is downloaded and cached.
 
+    The SHA-256 of a downloaded model is recorded next to it
+    (``<name>.sha256``), so a truncated or replaced cache file is detected and
+    downloaded again instead of failing later during export or inference.
+
+    With ``shared_cache_dir`` a model found there is hardlinked into
+    ``cache_dir`` instead of downloaded, and new downloads are linked back
+    into it for the next caller.
+
     Args:
         model_name: Name of the YOLO model file (e.g., 'yolo11n.pt')
         cache_dir: Directory to save the model to
+        sha256: Expected SHA-256 of the model file, if known
+        shared_cache_dir: Host-wide cache to reuse downloads from
 
     Returns:
         Path to the downloaded model file
 
     Raises:
-        RuntimeError: If model download fails
+        RuntimeError: If model download fails or the checksum does not match
     """
     if cache_dir is None:
         cache_dir = Path.cwd() / "models"
@@ -69,7 +140,23 @@ def ensure_yolo_model_downloaded(
     model_path.parent.mkdir(parents=True, exist_ok=True)
 
     if model_path.exists():
-        logger.info("Using cached YOLO model at %s", model_path)
+        if _is_cached_model_valid(model_path, sha256):
+            logger.info("Using cached YOLO model at %s", model_path)
+            return model_path
+        logger.warning("Checksum mismatch for cached %s, re-downloading", model_path)
+        model_path.unlink()
+
+    shared_path = shared_cache_dir / model_name if shared_cache_dir else None
+    if shared_path == model_path:
+        shared_path = None
+    if (
+        shared_path is not None
+        and shared_path.exists()
+        and _is_cached_model_valid(shared_path, sha256)
+    ):
+        logger.info("Linking YOLO model from shared cache %s", shared_path)
+        _link_or_copy(shared_path, model_path)
+        _checksum_path(model_path).write_text(_sha256sum(model_path))
         return model_path
 
     logger.info("Downloading YOLO model %s to %s...", model_name, model_path)
@@ -77,7 +164,7 @@ def ensure_yolo_model_downloaded(
     try:
         # Download the model using Ultralytics YOLO
         # We load it, which triggers a download if not found locally or in cwd
-        model = YOLO(model_name)
+        model = _get_yolo_class()(model_name)
 
         # If the model was downloaded to CWD or some other default location,
         # we need to save it to our target location.
@@ -93,6 +180,19 @@ def ensure_yolo_model_downloaded(
             model.save(str(model_path))
             logger.info("Saved YOLO model to %s", model_path)
 
+        digest = _sha256sum(model_path)
+        if sha256 is not None and digest != sha256:
+            raise ValueError(f"checksum mismatch (expected {sha256}, got {digest})")
+        _checksum_path(model_path).write_text(digest)
+
+        if shared_path is not None:
+            try:
+                shared_path.parent.mkdir(parents=True, exist_ok=True)
+                _link_or_copy(model_path, shared_path)
+                _checksum_path(shared_path).write_text(digest)
+            except OSError as e:
+                logger.warning("Could not add %s to shared cache: %s", model_name, e)
+
         return model_path
 
     except Exception as e:
@@ -129,15 +229,18 @@ def quantize_onnx_dynamic(model_path: Path) -> None:
     Raises:
         RuntimeError: If onnxruntime.transformers is not available
     """
-    if not HAS_ONNX_QUANTIZATION or not onnx:
+    onnx = _import_optional("onnx")
+    float16 = _import_optional("onnxruntime.transformers.float16")
+    if onnx is None or float16 is None:
         raise RuntimeError("onnx, onnxruntime are required for FP16 conversion. ")
 
     logger.info("Converting ONNX model to FP16 (mixed precision)...")
 
-    model = onnx.load(str(model_path))
-
-    model_fp16 = convert_float_to_float16(
-        model,
+    # Given a path, the converter runs shape inference file-to-file and loads
+    # the result once, instead of inferring on a serialized in-memory copy:
+    # peak memory stays at about one model for the DPT variants.
+    model_fp16 = float16.convert_float_to_float16(
+        str(model_path),
         keep_io_types=True,
         op_block_list=FP16_OP_BLOCK_LIST,
     )
@@ -146,6 +249,279 @@ def quantize_onnx_dynamic(model_path: Path) -> None:
     logger.info("FP16 conversion complete: %s", model_path)
 
 
+# Calibration images used for static INT8 quantization
+CALIBRATION_IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".bmp")
+MAX_CALIBRATION_IMAGES = 32
+
+
+def calibration_images(
+    image_dir: Path, limit: int = MAX_CALIBRATION_IMAGES
+) -> list[Path]:
+    """List up to ``limit`` calibration images in ``image_dir``, sorted by name."""
+    images = sorted(
+        p for p in image_dir.iterdir() if p.suffix.lower() in CALIBRATION_IMAGE_SUFFIXES
+    )
+    if not images:
+        raise ValueError(f"No calibration images found in {image_dir}")
+    return images[:limit]
+
+
+class YoloCalibrationReader:
+    """Feed calibration images to ORT static quantization.
+
+    Implements onnxruntime's ``CalibrationDataReader`` protocol
+    (``get_next``). Images are letterboxed and scaled to [0, 1] in NCHW
+    layout, the same preprocessing the ONNX detector applies.
+    """
+
+    def __init__(self, images: list[Path], imgsz: int, input_name: str = "images"):
+        self._images = iter(images)
+        self._imgsz = imgsz
+        self._input_name = input_name
+
+    def get_next(self) -> Optional[dict[str, np.ndarray]]:
+        for path in self._images:
+            image = cv2.imread(str(path))
+            if image is None:
+                logger.warning("Skipping unreadable calibration image %s", path)
+                continue
+            rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            resized, _, _ = letterbox(rgb, self._imgsz)
+            tensor = np.transpose(resized.astype(np.float32) / 255.0, (2, 0, 1))
+            return {self._input_name: np.ascontiguousarray(tensor[np.newaxis])}
+        return None
+
+
+def quantize_onnx_int8(
+    model_path: Path, calibration_reader: Optional[Any] = None
+) -> Path:
+    """Write an INT8-quantized copy of an FP32 ONNX model.
+
+    Without a calibration reader, weights are stored as INT8 and activations
+    are quantized at runtime (dynamic quantization). With one, activation
+    ranges are calibrated ahead of time and the model is written in QDQ
+    format, so Conv layers run as INT8 kernels end to end (static
+    quantization). The copy is written next to the source model as
+    ``<name>.int8.onnx``.
+
+    Args:
+        model_path: Path to the FP32 ONNX model to quantize
+        calibration_reader: ``CalibrationDataReader`` for static quantization
+
+    Returns:
+        Path to the quantized ONNX model
+
+    Raises:
+        RuntimeError: If onnxruntime.quantization is not available
+    """
+    quantization = _import_optional("onnxruntime.quantization")
+    if quantization is None:
+        raise RuntimeError("onnxruntime is required for INT8 quantization.")
+
+    int8_path = _int8_path(model_path)
+
+    if calibration_reader is not None:
+        logger.info("Quantizing ONNX model to INT8 (static, calibrated)...")
+        quantization.quantize_static(
+            str(model_path),
+            str(int8_path),
+            calibration_reader,
+            quant_format=quantization.QuantFormat.QDQ,
+            activation_type=quantization.QuantType.QInt8,
+            weight_type=quantization.QuantType.QInt8,
+        )
+    else:
+        logger.info("Quantizing ONNX model to INT8 (dynamic)...")
+        quantization.quantize_dynamic(
+            str(model_path),
+            str(int8_path),
+            weight_type=quantization.QuantType.QInt8,
+        )
+
+    logger.info("INT8 quantization complete: %s", int8_path)
+    return int8_path
+
+
+def simplify_onnx_graph(model_path: Path) -> None:
+    """Simplify an ONNX graph in-place with onnxslim.
+
+    Folds constants and removes redundant nodes left over by tracing, the
+    same pass Ultralytics runs for ``simplify=True``. Skipped when onnxslim
+    (``onnx-tools`` extra) is not installed.
+    """
+    onnxslim = _import_optional("onnxslim")
+    if onnxslim is None:
+        logger.warning("onnxslim not installed, skipping ONNX simplification")
+        return
+    logger.info("Simplifying ONNX graph with onnxslim...")
+    onnxslim.slim(str(model_path), output_model=str(model_path))
+
+
+# Protobuf cannot serialize a single ModelProto beyond 2 GB
+MAX_PROTOBUF_BYTES = 2**31 - 1
+
+
+def _infer_symbolic_shapes(onnx: Any, model_path: Path) -> bool:
+    """Run ONNX Runtime's symbolic shape inference in-place if possible."""
+    symbolic = _import_optional("onnxruntime.tools.symbolic_shape_infer")
+    if symbolic is None or model_path.stat().st_size >= MAX_PROTOBUF_BYTES:
+        return False
+    try:
+        model = symbolic.SymbolicShapeInference.infer_shapes(
+            onnx.load(str(model_path)), auto_merge=True
+        )
+    except Exception as e:
+        logger.warning("Symbolic shape inference failed, using onnx's: %s", e)
+        return False
+    onnx.save(model, str(model_path))
+    return True
+
+
+def infer_onnx_shapes(model_path: Path) -> None:
+    """Run ONNX shape inference, store the shapes in-place and check the model.
+
+    Execution providers can use the baked-in value_info for planning, and a
+    failing inference or ``onnx.checker`` run surfaces export bugs right away
+    instead of at service start. ONNX Runtime's symbolic shape inference is
+    tried first: it also evaluates shape arithmetic (Shape/Slice/Concat into
+    Reshape or Resize), so fixed-shape exports end up with concrete shapes
+    on every tensor, which TensorRT and other providers need to pick
+    specialized kernels. ``onnx.shape_inference`` is the fallback. Skipped
+    when onnx is not installed.
+    """
+    onnx = _import_optional("onnx")
+    if onnx is None:
+        return
+    if not _infer_symbolic_shapes(onnx, model_path):
+        onnx.shape_inference.infer_shapes_path(str(model_path), str(model_path))
+    # the path variant also handles models with external data (>2 GB)
+    onnx.checker.check_model(str(model_path))
+
+
+# ONNX Runtime graph optimization levels selectable for the offline pass
+ORT_OPTIMIZATION_LEVELS = {
+    "basic": "ORT_ENABLE_BASIC",
+    "extended": "ORT_ENABLE_EXTENDED",
+    "all": "ORT_ENABLE_ALL",
+}
+
+
+def optimize_onnx_graph(model_path: Path, level: str = "all") -> Path:
+    """Write an ONNX Runtime optimized copy of a model as ``<name>_opt.onnx``.
+
+    Applies graph optimizations (constant folding, node fusions, layout
+    transforms) ahead of time, so sessions loading the copy skip that work.
+    The result is specific to the ORT version and hardware it was built on;
+    keep the unoptimized model as the portable artifact. Fall back to
+    ``"extended"`` or ``"basic"`` if the fully fused graph misbehaves.
+
+    Args:
+        model_path: Path to the ONNX model to optimize
+        level: One of ``"basic"``, ``"extended"`` or ``"all"``
+
+    Returns:
+        Path to the optimized ONNX model
+
+    Raises:
+        RuntimeError: If onnxruntime is not available
+        ValueError: If the optimization level is unknown
+    """
+    ort = _import_optional("onnxruntime")
+    if ort is None:
+        raise RuntimeError("onnxruntime is required for graph optimization.")
+    if level not in ORT_OPTIMIZATION_LEVELS:
+        raise ValueError(f"Unknown ONNX Runtime optimization level: {level}")
+
+    optimized_path = _optimized_path(model_path)
+    logger.info("Optimizing ONNX graph with ONNX Runtime (level=%s)...", level)
+
+    sess_options = ort.SessionOptions()
+    sess_options.graph_optimization_level = getattr(
+        ort.GraphOptimizationLevel, ORT_OPTIMIZATION_LEVELS[level]
+    )
+    sess_options.optimized_model_filepath = str(optimized_path)
+    # Creating the session runs the optimizers and writes the optimized graph
+    ort.InferenceSession(
+        str(model_path), sess_options, providers=["CPUExecutionProvider"]
+    )
+
+    logger.info("Optimized ONNX model written to: %s", optimized_path)
+    return optimized_path
+
+
+# Tracing and constant folding rarely scale past a handful of cores
+MAX_EXPORT_THREADS = 8
+
+
+def _limit_export_threads(num_threads: Optional[int] = None) -> None:
+    """Cap the torch, OpenMP and MKL thread pools used during an export.
+
+    The OpenMP/MKL variables only take effect before torch is first imported,
+    which the lazy import makes the common case; explicitly set values win.
+    """
+    if not num_threads:
+        num_threads = min(MAX_EXPORT_THREADS, os.cpu_count() or 1)
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ.setdefault(var, str(num_threads))
+    _get_torch().set_num_threads(num_threads)
+
+
+def _export_fingerprint(sources: Iterable[Path], **options: Any) -> str:
+    """Hash the export sources and options that determine an ONNX export."""
+    digest = hashlib.blake2b(digest_size=16)
+    for source in sorted(sources):
+        with source.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def _fingerprint_path(output_path: Path) -> Path:
+    return output_path.with_name(output_path.name + ".blake2b")
+
+
+def _int8_path(model_path: Path) -> Path:
+    return model_path.with_suffix(".int8.onnx")
+
+
+def _optimized_path(model_path: Path) -> Path:
+    return model_path.with_name(f"{model_path.stem}_opt.onnx")
+
+
+def _side_outputs(output_path: Path, int8: bool, optimize: bool) -> list[Path]:
+    """Return the extra files an export with these options writes."""
+    outputs = []
+    if int8:
+        outputs.append(_int8_path(output_path))
+    if optimize:
+        outputs.append(_optimized_path(output_path))
+    return outputs
+
+
+def _is_export_up_to_date(
+    output_path: Path,
+    sources: list[Path],
+    fingerprint: str,
+    side_outputs: Iterable[Path] = (),
+) -> bool:
+    """Check whether an existing ONNX export still matches its sources.
+
+    The mtime comparison is the cheap first check; the stored fingerprint
+    catches mtime-preserving copies of a different checkpoint and changed
+    export options. Side outputs (INT8 / optimized copies) must exist too,
+    so deleting one of them triggers a new export.
+    """
+    if not sources or not output_path.exists():
+        return False
+    if not all(p.exists() for p in side_outputs):
+        return False
+    if output_path.stat().st_mtime < max(p.stat().st_mtime for p in sources):
+        return False
+    stamp = _fingerprint_path(output_path)
+    return stamp.exists() and stamp.read_text().strip() == fingerprint
+
+
 def export_yolo_to_onnx(
     yolo_path: Path,
     output_path: Path,
@@ -153,6 +529,14 @@ def export_yolo_to_onnx(
     imgsz: int = 384,
     simplify: bool = True,
     half: bool = False,
+    int8: bool = False,
+    int8_calibration_dir: Optional[Path] = None,
+    dynamic: bool = False,
+    dynamic_batch: bool = False,
+    force: bool = False,
+    optimize: bool = False,
+    optimize_level: str = "all",
+    num_threads: Optional[int] = None,
 ) -> Path:
     """Export YOLO model to ONNX format.
 
@@ -162,7 +546,19 @@ def export_yolo_to_onnx(
         opset: ONNX opset version
         imgsz: Image size
         simplify: Whether to run ONNX simplifier
-        half: Apply INT8 quantization for smaller model size (better than FP16 for CPU)
+        half: Apply FP16 conversion for smaller model size
+        int8: Also write a dynamically INT8-quantized copy (``.int8.onnx``)
+        int8_calibration_dir: Directory with sample images; makes the INT8
+            copy statically quantized, calibrated on up to 32 of them
+        dynamic: Export with dynamic batch/height/width axes instead of a
+            fixed ``imgsz`` input shape
+        dynamic_batch: Make the batch axis dynamic so several images can be
+            run at once. Ultralytics can only make all axes dynamic, so this
+            implies ``dynamic`` for YOLO
+        force: Re-export even if the existing output is up to date
+        optimize: Also write an ONNX Runtime optimized copy (``_opt.onnx``)
+        optimize_level: ONNX Runtime optimization level for that copy
+        num_threads: Intra-op threads for the export (default: min(8, CPUs))
 
     Returns:
         Path to the exported ONNX model
@@ -172,7 +568,34 @@ def export_yolo_to_onnx(
         if not yolo_path.exists():
             raise FileNotFoundError(f"YOLO model not found at {yolo_path}")
 
-        model = YOLO(str(yolo_path))
+        calibration = (
+            calibration_images(int8_calibration_dir)
+            if int8 and int8_calibration_dir is not None
+            else []
+        )
+        sources = [yolo_path, *calibration]
+        fingerprint = _export_fingerprint(
+            sources,
+            opset=opset,
+            imgsz=imgsz,
+            simplify=simplify,
+            half=half,
+            int8=int8,
+            dynamic=dynamic,
+            dynamic_batch=dynamic_batch,
+            optimize=optimize,
+            optimize_level=optimize_level,
+        )
+        side_outputs = _side_outputs(output_path, int8, optimize)
+        if not force and _is_export_up_to_date(
+            output_path, sources, fingerprint, side_outputs
+        ):
+            logger.info("YOLO ONNX model up to date, skipping: %s", output_path)
+            return output_path
+
+        _limit_export_threads(num_threads)
+
+        model = _get_yolo_class()(str(yolo_path))
 
         # Export to ONNX in FP32 first
         exported_filename = model.export(
@@ -181,6 +604,7 @@ def export_yolo_to_onnx(
             imgsz=imgsz,
             simplify=simplify,
             half=False,
+            dynamic=dynamic or dynamic_batch,
         )
 
         exported_path = Path(exported_filename).resolve()
@@ -192,10 +616,19 @@ def export_yolo_to_onnx(
             shutil.move(str(exported_path), str(output_path))
             logger.info("Moved exported YOLO model to %s", output_path)
 
-        # Apply INT8 quantization if requested (replaces old FP16 conversion)
+        # Quantize from the FP32 graph before it is converted to FP16
+        if int8:
+            reader = YoloCalibrationReader(calibration, imgsz) if calibration else None
+            quantize_onnx_int8(output_path, reader)
+
         if half:
             quantize_onnx_dynamic(output_path)
 
+        infer_onnx_shapes(output_path)
+        if optimize:
+            optimize_onnx_graph(output_path, optimize_level)
+
+        _fingerprint_path(output_path).write_text(fingerprint)
         logger.info("YOLO ONNX model ready at: %s", output_path)
         return output_path
 
@@ -211,6 +644,35 @@ def get_midas_cache_dir(custom_path: Optional[Path] = None) -> Path:
     return PYTORCH_HUB_CACHE
 
 
+def _find_local_hub_repo(cache_dir: Path, model_repo: str) -> Optional[Path]:
+    """Find a torch.hub checkout of ``model_repo`` inside ``cache_dir``.
+
+    torch.hub clones ``owner/name[:ref]`` into ``<hub_dir>/owner_name_ref``.
+    """
+    repo, _, ref = model_repo.partition(":")
+    owner, _, name = repo.partition("/")
+    branch = ref.replace("/", "_") if ref else "*"
+    matches = sorted(
+        p for p in cache_dir.glob(f"{owner}_{name}_{branch}") if p.is_dir()
+    )
+    return matches[0] if matches else None
+
+
+def _load_midas_from_hub(model_repo: str, model_type: str, cache_dir: Path) -> Any:
+    """Load a MiDaS model, preferring an already cloned hub repo.
+
+    A remote ``torch.hub.load`` queries GitHub on every call (to resolve the
+    default branch), even when the repo is cached. Loading the cached checkout
+    with ``source="local"`` avoids that round-trip and works offline; the
+    weights come from ``<cache_dir>/checkpoints`` either way.
+    """
+    local_repo = _find_local_hub_repo(cache_dir, model_repo)
+    if local_repo is not None:
+        logger.info("Loading %s from local hub repo %s", model_type, local_repo)
+        return _get_torch().hub.load(str(local_repo), model_type, source="local")
+    return _get_torch().hub.load(model_repo, model_type, trust_repo=True)
+
+
 def ensure_midas_model_available(
     model_type: str = DEFAULT_MIDAS_MODEL,
     midas_repo: str = DEFAULT_MIDAS_REPO,
@@ -233,10 +695,10 @@ def ensure_midas_model_available(
         logger.info(
             "Downloading %s model from %s to %s...", model_type, midas_repo, cache_dir
         )
-        torch.hub.set_dir(str(cache_dir))
+        _get_torch().hub.set_dir(str(cache_dir))
 
         # This triggers download if not present
-        model = torch.hub.load(midas_repo, model_type, trust_repo=True)
+        model = _load_midas_from_hub(midas_repo, model_type, cache_dir)
         model.eval()
 
         logger.info("%s model is cached and ready in %s", model_type, cache_dir)
@@ -258,6 +720,24 @@ def get_midas_onnx_config(model_type: str) -> tuple[int, str]:
     return config_map.get(model_type, (384, f"{model_type.lower()}.onnx"))
 
 
+# Weight files the MiDaS hubconf downloads into <hub dir>/checkpoints
+MIDAS_CHECKPOINTS = {
+    "MiDaS_small": "midas_v21_small_256.pt",
+    "MiDaS": "midas_v21_384.pt",
+    "DPT_Hybrid": "dpt_hybrid_384.pt",
+    "DPT_Large": "dpt_large_384.pt",
+}
+
+
+def _midas_checkpoint(cache_dir: Path, model_type: str) -> Optional[Path]:
+    """Return the downloaded weights for ``model_type``, if they are cached."""
+    filename = MIDAS_CHECKPOINTS.get(model_type)
+    if filename is None:
+        return None
+    checkpoint = cache_dir / "checkpoints" / filename
+    return checkpoint if checkpoint.is_file() else None
+
+
 def export_midas_to_onnx(
     cache_dir: Path,
     output_path: Path,
@@ -265,7 +745,16 @@ def export_midas_to_onnx(
     model_repo: str = "intel-isl/MiDaS",
     opset: int = 18,
     input_size: Optional[int] = None,
+    simplify: bool = True,
     half: bool = False,
+    int8: bool = False,
+    dynamic: bool = False,
+    dynamic_batch: bool = False,
+    force: bool = False,
+    optimize: bool = False,
+    optimize_level: str = "all",
+    num_threads: Optional[int] = None,
+    device: str = "cpu",
 ) -> Path:
     """Export MiDaS model to ONNX format.
 
@@ -276,24 +765,83 @@ def export_midas_to_onnx(
         model_repo: Repo
         opset: ONNX opset version
         input_size: Optional manual input size override
+        simplify: Whether to run the onnxslim simplifier on the export
         half: Apply FP16 quantization for smaller model size
+        int8: Also write a dynamically INT8-quantized copy (``.int8.onnx``)
+        dynamic: Export with dynamic batch/height/width axes instead of a
+            fixed ``input_size`` shape
+        dynamic_batch: Only make the batch axis dynamic, keeping the fixed
+            ``input_size`` height and width
+        force: Re-export even if the existing output is up to date
+        optimize: Also write an ONNX Runtime optimized copy (``_opt.onnx``)
+        optimize_level: ONNX Runtime optimization level for that copy
+        num_threads: Intra-op threads for the export (default: min(8, CPUs))
+        device: Device to trace on (``"cpu"``, ``"cuda"`` or ``"auto"`` for
+            CUDA when available). Tracing runs a full forward pass, which is
+            much faster on a GPU for the DPT models; the exported graph is the
+            same
 
     Returns:
         Path to the exported ONNX model
     """
     logger.info("Exporting %s model to ONNX (FP16=%s)...", model_type, half)
     try:
+        default_size, _ = get_midas_onnx_config(model_type)
+        size = input_size if input_size else default_size
+
+        export_options = {
+            "model_type": model_type,
+            "model_repo": model_repo,
+            "opset": opset,
+            "size": size,
+            "simplify": simplify,
+            "half": half,
+            "int8": int8,
+            "dynamic": dynamic,
+            "dynamic_batch": dynamic_batch,
+            "optimize": optimize,
+            "optimize_level": optimize_level,
+        }
+        side_outputs = _side_outputs(output_path, int8, optimize)
+        checkpoint = _midas_checkpoint(Path(cache_dir), model_type)
+        if not force and checkpoint is not None:
+            sources = [checkpoint]
+            fingerprint = _export_fingerprint(sources, **export_options)
+            if _is_export_up_to_date(output_path, sources, fingerprint, side_outputs):
+                logger.info(
+                    "%s ONNX model up to date, skipping: %s", model_type, output_path
+                )
+                return output_path
+
+        _limit_export_threads(num_threads)
+        torch = _get_torch()
         torch.hub.set_dir(str(cache_dir))
-        model = torch.hub.load(model_repo, model_type, trust_repo=True)
-        model.eval()
+        if device == "auto":
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+        model = _load_midas_from_hub(model_repo, model_type, Path(cache_dir))
+        model.eval().to(device)
+        # The weights are only guaranteed to be on disk once the model is loaded
+        checkpoint = _midas_checkpoint(Path(cache_dir), model_type)
+        fingerprint = _export_fingerprint(
+            [checkpoint] if checkpoint else [], **export_options
+        )
 
         # Always export in FP32 first, then quantize post-export
-        default_size, _ = get_midas_onnx_config(model_type)
-        size = input_size if input_size else default_size
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        dummy_input = torch.randn(1, 3, size, size)
+        dummy_input = torch.randn(1, 3, size, size, device=device)
+
+        # Fixed shapes by default: ORT/TensorRT can only specialize kernels
+        # and plan memory ahead of time when every dimension is known.
+        dynamic_axes: Optional[dict[str, dict[int, str]]] = None
+        if dynamic:
+            dynamic_axes = {
+                "input": {0: "batch", 2: "height", 3: "width"},
+                "output": {0: "batch", 1: "height", 2: "width"},
+            }
+        elif dynamic_batch:
+            dynamic_axes = {"input": {0: "batch"}, "output": {0: "batch"}}
 
         torch.onnx.export(
             model,
@@ -304,11 +852,23 @@ def export_midas_to_onnx(
             do_constant_folding=True,
             input_names=["input"],
             output_names=["output"],
+            dynamic_axes=dynamic_axes,
         )
 
+        if simplify:
+            simplify_onnx_graph(output_path)
+
+        if int8:
+            quantize_onnx_int8(output_path)
+
         if half:
             quantize_onnx_dynamic(output_path)
 
+        infer_onnx_shapes(output_path)
+        if optimize:
+            optimize_onnx_graph(output_path, optimize_level)
+
+        _fingerprint_path(output_path).write_text(fingerprint)
         logger.info("%s ONNX model ready at: %s", model_type, output_path)
         return output_path
     except Exception as e:
@@ -340,14 +900,17 @@ def ensure_depth_anything_model_available(
     logger.info("Cache dir: %s", cache_dir)
 
     try:
-        if AutoImageProcessor is None or AutoModelForDepthEstimation is None:
+        transformers = _import_optional("transformers")
+        if transformers is None:
             raise ImportError(
                 "transformers not installed. "
                 "Please run `uv sync --extra inference` or install `transformers`."
             )
         # These calls trigger download or load from cache
-        AutoImageProcessor.from_pretrained(model_name, cache_dir=cache_dir)
-        AutoModelForDepthEstimation.from_pretrained(model_name, cache_dir=cache_dir)
+        transformers.AutoImageProcessor.from_pretrained(model_name, cache_dir=cache_dir)
+        transformers.AutoModelForDepthEstimation.from_pretrained(
+            model_name, cache_dir=cache_dir
+        )
 
         logger.info("Depth Anything model is ready.")
         return cache_dir
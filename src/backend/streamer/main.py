@@ -1,6 +1,7 @@
 # SPDX-FileCopyrightText: 2025 robot-visual-perception
 #
 # SPDX-License-Identifier: MIT
+import logging
 from contextlib import asynccontextmanager, suppress
 from collections.abc import AsyncIterator
 
@@ -9,14 +10,30 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from common import __version__
 from common.config import config
-from streamer.routes import router, on_shutdown
+from common.core.camera import _shared_cam
+from streamer.routes import router, on_shutdown, VIDEO_SOURCE_TYPE
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Open the camera up front so the first /offer doesn't wait for device
+    # initialization (hundreds of ms on some backends). The service keeps its
+    # own reference, so the camera stays warm between peer connections.
+    prewarmed = False
+    if config.CAMERA_PREWARM and VIDEO_SOURCE_TYPE == "webcam":
+        try:
+            await _shared_cam.acquire()
+            prewarmed = True
+        except Exception as e:
+            logger.warning("Camera pre-warm failed, opening on first offer: %s", e)
     yield
     with suppress(Exception):
         await on_shutdown()
+    if prewarmed:
+        with suppress(Exception):
+            await _shared_cam.release()
 
 
 def create_app() -> FastAPI:
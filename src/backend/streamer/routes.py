@@ -3,7 +3,6 @@
 # SPDX-License-Identifier: MIT
 import asyncio
 import contextlib
-from typing import List
 
 from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel
@@ -22,7 +21,7 @@ from streamer.tracks import CameraVideoTrack, VideoFileTrack
 router = APIRouter()
 
 # Global state for this service
-pcs: List[RTCPeerConnection] = []
+pcs: set[RTCPeerConnection] = set()
 
 # config variables
 VIDEO_SOURCE_TYPE = config.VIDEO_SOURCE_TYPE
@@ -67,7 +66,7 @@ async def offer(sdp: SDPModel) -> dict[str, str]:
 
     cfg = RTCConfiguration(iceServers=[RTCIceServer(urls=[config.STUN_SERVER])])
     pc = RTCPeerConnection(configuration=cfg)
-    pcs.append(pc)
+    pcs.add(pc)
 
     ice_ready = asyncio.get_event_loop().create_future()
 
@@ -82,7 +81,7 @@ async def offer(sdp: SDPModel) -> dict[str, str]:
         pc.addTrack(local_video)
     except Exception as e:
         await pc.close()
-        pcs.remove(pc)
+        pcs.discard(pc)
         raise HTTPException(500, f"Video source error: {e}")
 
     # Prefer H.264 for better compatibility
@@ -128,8 +127,7 @@ async def on_shutdown() -> None:
 
 async def _cleanup_pc(pc: RTCPeerConnection) -> None:
     """Clean up a peer connection."""
-    if pc in pcs:
-        pcs.remove(pc)
+    pcs.discard(pc)
     with contextlib.suppress(Exception):
         await pc.close()
     if not pcs and VIDEO_SOURCE_TYPE == "webcam":
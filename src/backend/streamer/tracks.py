@@ -11,6 +11,10 @@ from aiortc import VideoStreamTrack
 from av import VideoFrame
 
 from common.core.camera import _shared_cam
+from common.utils.camera import mirror_frame
+
+# Upper bound for a single wait on the shared camera (seconds)
+FRAME_WAIT_TIMEOUT = 1.0
 
 
 class CameraVideoTrack(VideoStreamTrack):
@@ -22,6 +26,8 @@ class CameraVideoTrack(VideoStreamTrack):
 
     def __init__(self) -> None:
         super().__init__()
+        self._frames: asyncio.Queue[np.ndarray] | None = None
+        self._video_frame: VideoFrame | None = None
 
     async def recv(self) -> VideoFrame:
         """Return the next raw camera frame as WebRTC VideoFrame."""
@@ -29,31 +35,71 @@ class CameraVideoTrack(VideoStreamTrack):
         # get next WebRTC timestamp
         pts, time_base = await self.next_timestamp()
 
-        # wait for new frame from shared camera
+        if self._frames is None:
+            self._frames = _shared_cam.subscribe()
+
+        # wait for the newest frame from the shared camera (RAW Frame: BGR or
+        # packed YUYV, numpy)
         frame = None
-        tries = 0
         while frame is None:
-            frame = _shared_cam.latest()  # RAW Frame: BGR, numpy
-            if frame is not None:
-                break
-
-            tries += 1
-            # wait for a bit if camera is not sending
-            await asyncio.sleep(0.005 if tries < 100 else 0.008)
-            if tries >= 100:
-                tries = 0
-
-        # Horizontally flip the WebCam
-        frame = frame[:, ::-1]
-
-        # numpy (BGR) → WebRTC-Frame
+            try:
+                frame = await asyncio.wait_for(
+                    self._frames.get(), timeout=FRAME_WAIT_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                # camera stalled: repeat the last frame to keep the stream alive
+                frame = _shared_cam.latest()
+
+        # numpy (BGR/YUYV) → WebRTC-Frame, horizontally flipping the WebCam
+        # on the way so the frame is copied only once
         # aiortc expect a video frame object
-        video_frame = VideoFrame.from_ndarray(frame, format="bgr24")
+        video_frame = self._to_video_frame(frame, _shared_cam.pixel_format, mirror=True)
         video_frame.pts = pts
         video_frame.time_base = time_base
 
         return video_frame
 
+    def _to_video_frame(
+        self, frame: np.ndarray, pixel_format: str, mirror: bool = False
+    ) -> VideoFrame:
+        """Copy a frame into the track's reusable VideoFrame.
+
+        The sender encodes each frame before requesting the next one, so a
+        single VideoFrame can be refilled every time instead of allocating new
+        frame/plane objects per call. It is reallocated when the size or pixel
+        format changes. With ``mirror`` the frame is flipped horizontally
+        while it is written into the (aligned, possibly row-padded) plane.
+        """
+        height, width, channels = frame.shape
+        video_frame = self._video_frame
+        if (
+            video_frame is None
+            or video_frame.width != width
+            or video_frame.height != height
+            or video_frame.format.name != pixel_format
+        ):
+            video_frame = VideoFrame(width, height, pixel_format)
+            self._video_frame = video_frame
+
+        # packed formats live in a single plane whose rows may be padded
+        plane = video_frame.planes[0]
+        rows = np.frombuffer(memoryview(plane), dtype=np.uint8).reshape(
+            height, plane.line_size
+        )
+        view = rows[:, : width * channels].reshape(height, width, channels)
+        if mirror:
+            mirror_frame(frame, pixel_format, out=view)
+        else:
+            np.copyto(view, frame)
+        return video_frame
+
+    def stop(self) -> None:
+        """Stop the track and detach it from the shared camera."""
+        if self._frames is not None:
+            _shared_cam.unsubscribe(self._frames)
+            self._frames = None
+        super().stop()
+
 
 class VideoFileTrack(VideoStreamTrack):
     """
@@ -29,7 +29,7 @@ def camera_mod(monkeypatch, dummy_cap):
     import common.core.camera as camera
 
     camera._shared_cam = camera._SharedCamera()
-    monkeypatch.setattr(camera, "open_camera", lambda idx: dummy_cap)
+    monkeypatch.setattr(camera, "open_camera", lambda idx, preferred_backend="": dummy_cap)
     return camera
 
 
@@ -50,7 +50,7 @@ async def test_acquire_and_release(camera_mod, number_of_acquires: int):
     assert cam._running is True
     assert cam._cap is not None
     assert cam._refcount == number_of_acquires
-    assert cam._reader_task is not None
+    assert cam._reader_thread is not None
 
     # Let the read loop fetch a frame
     await asyncio.sleep(0.1)
@@ -62,14 +62,14 @@ async def test_acquire_and_release(camera_mod, number_of_acquires: int):
         assert cam._refcount == number_of_acquires - 1 - i
         assert cam._cap is not None
         assert cam._running is True
-        assert cam._reader_task is not None
+        assert cam._reader_thread is not None
 
     # Last release tears everything down
     await cam.release()
     assert cam._refcount == 0
     assert cam._cap is None
     assert cam._running is False
-    assert cam._reader_task is None
+    assert cam._reader_thread is None
 
 
 @pytest.mark.asyncio
@@ -79,10 +79,143 @@ async def test_acquire_propagates_open_errors(monkeypatch):
 
     camera._shared_cam = camera._SharedCamera()
 
-    def raise_funny_error(idx):
+    def raise_funny_error(idx, preferred_backend=""):
         raise RuntimeError("Hohoho")
 
     monkeypatch.setattr(camera, "open_camera", raise_funny_error)
 
     with pytest.raises(RuntimeError, match="Hohoho"):
         await camera._shared_cam.acquire()
+
+
+@pytest.mark.asyncio
+async def test_subscribe_receives_latest_frame(camera_mod):
+    """Test that subscribers get frames through a queue holding only the newest one."""
+    cam = camera_mod._shared_cam
+    await cam.acquire()
+    try:
+        queue = cam.subscribe()
+        assert queue.maxsize == 1
+
+        frame = await asyncio.wait_for(queue.get(), timeout=1.0)
+        assert frame.shape == (8, 8, 3)
+
+        await asyncio.sleep(0.05)
+        assert queue.qsize() <= 1
+
+        cam.unsubscribe(queue)
+        assert cam._subscribers == []
+    finally:
+        await cam.release()
+
+
+@pytest.mark.asyncio
+async def test_release_leaves_blocked_capture_to_reader_thread(monkeypatch):
+    """Test that a capture still in read() after the join timeout is not released under it."""
+    import threading
+
+    import common.core.camera as camera
+
+    unblock = threading.Event()
+    reading = threading.Event()
+
+    class BlockingCap:
+        def __init__(self):
+            self.opened = True
+            self.released_during_read = False
+
+        def isOpened(self):
+            return True
+
+        def read(self):
+            reading.set()
+            unblock.wait(5.0)
+            if not self.opened:
+                self.released_during_read = True
+            return True, np.zeros((8, 8, 3), dtype=np.uint8)
+
+        def release(self):
+            self.opened = False
+
+    cap = BlockingCap()
+    camera._shared_cam = camera._SharedCamera()
+    monkeypatch.setattr(camera, "open_camera", lambda idx, preferred_backend="": cap)
+    monkeypatch.setattr(camera, "READER_JOIN_TIMEOUT", 0.05)
+    cam = camera._shared_cam
+
+    await cam.acquire()
+    thread = cam._reader_thread
+    assert reading.wait(1.0)
+
+    await cam.release()
+    assert cam._cap is None
+    assert thread.is_alive()
+    assert cap.opened  # still owned by the blocked reader thread
+
+    unblock.set()
+    thread.join(1.0)
+    assert not thread.is_alive()
+    assert not cap.opened
+    assert not cap.released_during_read
+    assert cam.latest() is None
+
+
+@pytest.mark.asyncio
+async def test_mismatched_yuyv_buffer_is_not_published(monkeypatch):
+    """Test that a raw buffer not matching YUYV is dropped and capture falls back to BGR."""
+    import threading
+
+    import cv2
+
+    import common.core.camera as camera
+
+    unblock = threading.Event()
+
+    class RawCap:
+        def __init__(self):
+            self.reads = 0
+            self.props = {}
+
+        def isOpened(self):
+            return True
+
+        def get(self, prop):
+            return 8
+
+        def set(self, prop, value):
+            self.props[prop] = value
+            return True
+
+        def read(self):
+            self.reads += 1
+            if self.reads == 1:
+                # e.g. a compressed buffer instead of 8 x 8 x 2 YUYV bytes
+                return True, np.zeros((1, 100), dtype=np.uint8)
+            unblock.wait(5.0)
+            return True, np.zeros((8, 8, 3), dtype=np.uint8)
+
+        def release(self):
+            pass
+
+    cap = RawCap()
+    camera._shared_cam = camera._SharedCamera()
+    monkeypatch.setattr(camera, "open_camera", lambda idx, preferred_backend="": cap)
+    monkeypatch.setattr(camera, "configure_pixel_format", lambda cap, fourcc: "yuyv422")
+    cam = camera._shared_cam
+
+    queue = cam.subscribe()
+    await cam.acquire()
+    try:
+        await asyncio.sleep(0.1)
+        assert cap.reads >= 2
+        assert cam.pixel_format == "bgr24"
+        assert cap.props[cv2.CAP_PROP_CONVERT_RGB] == 1
+        assert queue.empty()
+        assert cam.latest() is None
+
+        unblock.set()
+        frame = await asyncio.wait_for(queue.get(), timeout=1.0)
+        assert frame.shape == (8, 8, 3)
+    finally:
+        unblock.set()
+        await cam.release()
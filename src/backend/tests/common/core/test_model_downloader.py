@@ -1,18 +1,30 @@
 # SPDX-FileCopyrightText: 2025 robot-visual-perception
 #
 # SPDX-License-Identifier: MIT
+import hashlib
+import os
+import shutil
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import cv2
 import numpy as np
 import pytest
 
 from common.utils.model_downloader import (
+    YoloCalibrationReader,
+    calibration_images,
     quantize_onnx_dynamic,
+    quantize_onnx_int8,
     ensure_midas_model_available,
     ensure_yolo_model_downloaded,
+    export_midas_to_onnx,
+    export_yolo_to_onnx,
     get_midas_cache_dir,
-    HAS_ONNX_QUANTIZATION,
+    infer_onnx_shapes,
+    optimize_onnx_graph,
+    shared_model_cache_dir,
+    simplify_onnx_graph,
 )
 
 try:
@@ -23,6 +35,11 @@ try:
 except ImportError:
     ONNX_AVAILABLE = False
 
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
 
 @pytest.fixture
 def tmp_models_dir(tmp_path):
@@ -90,7 +107,7 @@ def test_ensure_yolo_model_downloaded_downloads_if_not_cached(
     mock_yolo_instance.ckpt_path = str(tmp_models_dir / "downloaded_model.pt")
     mock_yolo.return_value = mock_yolo_instance
 
-    with patch("shutil.copy2") as mock_copy:
+    with patch("shutil.copy2", side_effect=shutil.copyfile) as mock_copy:
         downloaded_path = Path(mock_yolo_instance.ckpt_path)
         downloaded_path.touch()
 
@@ -102,6 +119,89 @@ def test_ensure_yolo_model_downloaded_downloads_if_not_cached(
         assert result == model_path
 
 
+def test_ensure_yolo_model_downloaded_records_checksum(tmp_models_dir, mock_yolo):
+    """Test that a downloaded model gets its SHA-256 recorded next to it."""
+    source = tmp_models_dir / "downloaded_model.pt"
+    source.write_bytes(b"weights")
+    mock_yolo.ckpt_path = str(source)
+
+    result = ensure_yolo_model_downloaded("yolo11n.pt", tmp_models_dir)
+
+    checksum = (tmp_models_dir / "yolo11n.pt.sha256").read_text()
+    assert checksum == hashlib.sha256(b"weights").hexdigest()
+    assert result.read_bytes() == b"weights"
+
+
+def test_ensure_yolo_model_downloaded_redownloads_on_checksum_mismatch(
+    tmp_models_dir, mock_yolo
+):
+    """Test that a corrupted cached model is downloaded again."""
+    model_path = tmp_models_dir / "yolo11n.pt"
+    model_path.write_bytes(b"truncated")
+    source = tmp_models_dir / "downloaded_model.pt"
+    source.write_bytes(b"weights")
+    mock_yolo.ckpt_path = str(source)
+
+    result = ensure_yolo_model_downloaded(
+        "yolo11n.pt",
+        tmp_models_dir,
+        sha256=hashlib.sha256(b"weights").hexdigest(),
+    )
+
+    assert result.read_bytes() == b"weights"
+
+
+def test_ensure_yolo_model_downloaded_rejects_wrong_download(tmp_models_dir, mock_yolo):
+    """Test that a download not matching the expected checksum is removed."""
+    source = tmp_models_dir / "downloaded_model.pt"
+    source.write_bytes(b"weights")
+    mock_yolo.ckpt_path = str(source)
+
+    with pytest.raises(RuntimeError):
+        ensure_yolo_model_downloaded("yolo11n.pt", tmp_models_dir, sha256="0" * 64)
+
+    assert not (tmp_models_dir / "yolo11n.pt").exists()
+
+
+@patch("common.utils.model_downloader.YOLO")
+def test_ensure_yolo_model_downloaded_links_from_shared_cache(mock_yolo, tmp_path):
+    """Test that a model in the shared cache is linked instead of downloaded."""
+    shared_dir = tmp_path / "shared"
+    shared_dir.mkdir()
+    (shared_dir / "yolo11n.pt").write_bytes(b"weights")
+    cache_dir = tmp_path / "models"
+
+    result = ensure_yolo_model_downloaded(
+        "yolo11n.pt", cache_dir, shared_cache_dir=shared_dir
+    )
+
+    assert result == cache_dir / "yolo11n.pt"
+    assert result.stat().st_ino == (shared_dir / "yolo11n.pt").stat().st_ino
+    mock_yolo.assert_not_called()
+
+
+def test_ensure_yolo_model_downloaded_fills_shared_cache(tmp_models_dir, mock_yolo):
+    """Test that a fresh download is added to the shared cache."""
+    shared_dir = tmp_models_dir.parent / "shared"
+    source = tmp_models_dir / "downloaded_model.pt"
+    source.write_bytes(b"weights")
+    mock_yolo.ckpt_path = str(source)
+
+    ensure_yolo_model_downloaded(
+        "yolo11n.pt", tmp_models_dir, shared_cache_dir=shared_dir
+    )
+
+    assert (shared_dir / "yolo11n.pt").read_bytes() == b"weights"
+    assert (shared_dir / "yolo11n.pt.sha256").exists()
+
+
+def test_shared_model_cache_dir_respects_xdg_cache_home(tmp_path, monkeypatch):
+    """Test that the shared cache lives under XDG_CACHE_HOME."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    assert shared_model_cache_dir() == tmp_path / "robot-visual-perception" / "models"
+
+
 def test_ensure_midas_model_available_sets_cache_directory(tmp_path, mock_torch):
     """Test that ensure_midas_model_available sets PyTorch Hub cache directory."""
     cache_dir = tmp_path / "midas_cache"
@@ -116,6 +216,19 @@ def test_ensure_midas_model_available_sets_cache_directory(tmp_path, mock_torch)
     )
 
 
+def test_ensure_midas_model_available_prefers_local_hub_repo(tmp_path, mock_torch):
+    """Test that a cached hub checkout is loaded locally instead of from GitHub."""
+    cache_dir = tmp_path / "midas_cache"
+    local_repo = cache_dir / "intel-isl_MiDaS_master"
+    local_repo.mkdir(parents=True)
+
+    ensure_midas_model_available(cache_dir=cache_dir)
+
+    mock_torch.hub.load.assert_called_once_with(
+        str(local_repo), "MiDaS_small", source="local"
+    )
+
+
 def test_ensure_midas_model_available_handles_errors_gracefully(tmp_path, mock_torch):
     """Test that ensure_midas_model_available raises RuntimeError on failure."""
     cache_dir = tmp_path / "midas_cache"
@@ -138,7 +251,7 @@ def test_ensure_yolo_model_downloaded_creates_cache_directory(tmp_path, mock_yol
     cache_dir = tmp_path / "new_models_dir"
     model_path = cache_dir / model_name
 
-    with patch("shutil.copy2") as mock_copy:
+    with patch("shutil.copy2", side_effect=shutil.copyfile) as mock_copy:
         # Mock the downloaded file
         downloaded_path = Path("/tmp/yolo11n.pt")
         mock_yolo.return_value.ckpt_path = str(downloaded_path)
@@ -159,8 +272,8 @@ def test_ensure_yolo_model_downloaded_creates_cache_directory(tmp_path, mock_yol
 
 
 @pytest.mark.skipif(
-    not ONNX_AVAILABLE or not HAS_ONNX_QUANTIZATION,
-    reason="onnx or onnxruntime.transformers.float16 not installed",
+    not ONNX_AVAILABLE or ort is None,
+    reason="onnx or onnxruntime not installed",
 )
 def test_quantize_onnx_dynamic(tmp_path):
     """Test FP16 conversion reduces model size and keeps IO types as FP32."""
@@ -189,3 +302,349 @@ def test_quantize_onnx_dynamic(tmp_path):
     # keep_io_types=True, inputs/outputs should remain FP32
     assert converted_model.graph.input[0].type.tensor_type.elem_type == TensorProto.FLOAT
     assert converted_model.graph.output[0].type.tensor_type.elem_type == TensorProto.FLOAT
+
+
+@pytest.mark.skipif(
+    not ONNX_AVAILABLE or ort is None,
+    reason="onnx or onnxruntime not installed",
+)
+def test_quantize_onnx_int8_writes_separate_model(tmp_path):
+    """Test INT8 quantization writes a smaller copy and leaves the FP32 model intact."""
+    weight_data = np.random.randn(100, 100).astype(np.float32)
+    weight_tensor = numpy_helper.from_array(weight_data, name="weight")
+    input_info = helper.make_tensor_value_info("input", TensorProto.FLOAT, [1, 100])
+    output_info = helper.make_tensor_value_info("output", TensorProto.FLOAT, [1, 100])
+    node = helper.make_node("MatMul", ["input", "weight"], ["output"])
+    graph = helper.make_graph(
+        [node], "test", [input_info], [output_info], [weight_tensor]
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+
+    model_path = tmp_path / "model.onnx"
+    onnx.save(model, str(model_path))
+    fp32_size = model_path.stat().st_size
+
+    int8_path = quantize_onnx_int8(model_path)
+
+    assert int8_path == tmp_path / "model.int8.onnx"
+    assert model_path.stat().st_size == fp32_size
+    assert int8_path.stat().st_size < fp32_size * 0.5
+
+
+@pytest.mark.skipif(
+    not ONNX_AVAILABLE or ort is None,
+    reason="onnx or onnxruntime not installed",
+)
+def test_quantize_onnx_int8_static_calibration(tmp_path):
+    """Test that a calibration reader produces a statically quantized QDQ model."""
+    weight_data = np.random.randn(4, 3, 3, 3).astype(np.float32)
+    weight_tensor = numpy_helper.from_array(weight_data, name="weight")
+    input_info = helper.make_tensor_value_info(
+        "images", TensorProto.FLOAT, [1, 3, 16, 16]
+    )
+    output_info = helper.make_tensor_value_info("output", TensorProto.FLOAT, None)
+    node = helper.make_node("Conv", ["images", "weight"], ["output"])
+    graph = helper.make_graph(
+        [node], "test", [input_info], [output_info], [weight_tensor]
+    )
+    # pinned onnxruntime loads IR versions up to 10
+    model = helper.make_model(
+        graph, opset_imports=[helper.make_opsetid("", 13)], ir_version=10
+    )
+    model_path = tmp_path / "model.onnx"
+    onnx.save(model, str(model_path))
+
+    image_dir = tmp_path / "calib"
+    image_dir.mkdir()
+    for i in range(2):
+        image = np.random.randint(0, 255, (20, 30, 3), dtype=np.uint8)
+        cv2.imwrite(str(image_dir / f"{i}.png"), image)
+    reader = YoloCalibrationReader(calibration_images(image_dir), imgsz=16)
+
+    int8_path = quantize_onnx_int8(model_path, reader)
+
+    op_types = {node.op_type for node in onnx.load(str(int8_path)).graph.node}
+    assert {"QuantizeLinear", "DequantizeLinear"} <= op_types
+
+
+def test_yolo_calibration_reader_letterboxes_images(tmp_path):
+    """Test that calibration samples match the detector's input layout."""
+    cv2.imwrite(str(tmp_path / "a.jpg"), np.zeros((20, 40, 3), dtype=np.uint8))
+    (tmp_path / "notes.txt").write_text("not an image")
+
+    images = calibration_images(tmp_path)
+    reader = YoloCalibrationReader(images, imgsz=32)
+
+    assert images == [tmp_path / "a.jpg"]
+    sample = reader.get_next()["images"]
+    assert sample.shape == (1, 3, 32, 32)
+    assert sample.dtype == np.float32
+    assert reader.get_next() is None
+
+
+def test_calibration_images_requires_images(tmp_path):
+    """Test that an empty calibration directory is reported."""
+    with pytest.raises(ValueError, match="No calibration images"):
+        calibration_images(tmp_path)
+
+
+@pytest.fixture
+def fake_yolo_export(tmp_path, mock_yolo, mock_torch):
+    """Make the mocked YOLO export write a file like Ultralytics does."""
+    exported = tmp_path / "exported.onnx"
+
+    def _export(**kwargs):
+        exported.write_bytes(b"onnx")
+        return str(exported)
+
+    mock_yolo.export.side_effect = _export
+    with patch("common.utils.model_downloader.infer_onnx_shapes"):
+        yield mock_yolo
+
+
+def test_export_yolo_to_onnx_skips_up_to_date_export(tmp_path, fake_yolo_export):
+    """Test that a repeat export is skipped unless forced."""
+    yolo_path = tmp_path / "yolo11n.pt"
+    yolo_path.write_bytes(b"weights")
+    output_path = tmp_path / "yolo11n.onnx"
+
+    export_yolo_to_onnx(yolo_path, output_path)
+    export_yolo_to_onnx(yolo_path, output_path)
+    assert fake_yolo_export.export.call_count == 1
+
+    export_yolo_to_onnx(yolo_path, output_path, force=True)
+    assert fake_yolo_export.export.call_count == 2
+
+
+def test_export_yolo_to_onnx_reexports_changed_weights(tmp_path, fake_yolo_export):
+    """Test that replaced weights are re-exported even if their mtime is older."""
+    yolo_path = tmp_path / "yolo11n.pt"
+    yolo_path.write_bytes(b"weights")
+    output_path = tmp_path / "yolo11n.onnx"
+    export_yolo_to_onnx(yolo_path, output_path)
+
+    stat = yolo_path.stat()
+    yolo_path.write_bytes(b"other weights")
+    os.utime(yolo_path, (stat.st_atime, stat.st_mtime))
+    export_yolo_to_onnx(yolo_path, output_path)
+    assert fake_yolo_export.export.call_count == 2
+
+    export_yolo_to_onnx(yolo_path, output_path, opset=17)
+    assert fake_yolo_export.export.call_count == 3
+
+
+def test_export_yolo_to_onnx_regenerates_missing_side_outputs(
+    tmp_path, fake_yolo_export
+):
+    """Test that a deleted INT8 or optimized copy triggers a new export."""
+    yolo_path = tmp_path / "yolo11n.pt"
+    yolo_path.write_bytes(b"weights")
+    output_path = tmp_path / "yolo11n.onnx"
+    int8_path = tmp_path / "yolo11n.int8.onnx"
+    optimized_path = tmp_path / "yolo11n_opt.onnx"
+
+    def _write_int8(model_path, reader=None):
+        int8_path.write_bytes(b"int8")
+        return int8_path
+
+    def _write_optimized(model_path, level):
+        optimized_path.write_bytes(b"opt")
+        return optimized_path
+
+    with (
+        patch(
+            "common.utils.model_downloader.quantize_onnx_int8",
+            side_effect=_write_int8,
+        ),
+        patch(
+            "common.utils.model_downloader.optimize_onnx_graph",
+            side_effect=_write_optimized,
+        ),
+    ):
+        export_yolo_to_onnx(yolo_path, output_path, int8=True, optimize=True)
+        export_yolo_to_onnx(yolo_path, output_path, int8=True, optimize=True)
+        assert fake_yolo_export.export.call_count == 1
+
+        int8_path.unlink()
+        export_yolo_to_onnx(yolo_path, output_path, int8=True, optimize=True)
+        assert fake_yolo_export.export.call_count == 2
+        assert int8_path.exists()
+
+        optimized_path.unlink()
+        export_yolo_to_onnx(yolo_path, output_path, int8=True, optimize=True)
+        assert fake_yolo_export.export.call_count == 3
+        assert optimized_path.exists()
+
+
+@pytest.mark.skipif(not ONNX_AVAILABLE, reason="onnx not installed")
+def test_infer_onnx_shapes_stores_shapes(tmp_path):
+    """Test that inferred intermediate shapes are written into the model."""
+    input_info = helper.make_tensor_value_info("input", TensorProto.FLOAT, [1, 4])
+    output_info = helper.make_tensor_value_info("output", TensorProto.FLOAT, [1, 4])
+    nodes = [
+        helper.make_node("Relu", ["input"], ["hidden"]),
+        helper.make_node("Relu", ["hidden"], ["output"]),
+    ]
+    graph = helper.make_graph(nodes, "test", [input_info], [output_info])
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model_path = tmp_path / "model.onnx"
+    onnx.save(model, str(model_path))
+
+    infer_onnx_shapes(model_path)
+
+    value_info = onnx.load(str(model_path)).graph.value_info
+    assert "hidden" in [info.name for info in value_info]
+
+
+@pytest.mark.skipif(
+    not ONNX_AVAILABLE or ort is None, reason="onnx or onnxruntime not installed"
+)
+def test_infer_onnx_shapes_resolves_computed_shapes(tmp_path):
+    """Test that shapes computed inside the graph are resolved to constants."""
+    input_info = helper.make_tensor_value_info("input", TensorProto.FLOAT, [1, 3, 8, 8])
+    output_info = helper.make_tensor_value_info("output", TensorProto.FLOAT, None)
+    # Reshape to input.shape[:2] + [-1], as traced flatten code produces
+    nodes = [
+        helper.make_node("Shape", ["input"], ["shape"]),
+        helper.make_node("Slice", ["shape", "start", "end"], ["leading"]),
+        helper.make_node("Concat", ["leading", "rest"], ["new_shape"], axis=0),
+        helper.make_node("Reshape", ["input", "new_shape"], ["output"]),
+    ]
+    initializers = [
+        numpy_helper.from_array(np.array([0], dtype=np.int64), "start"),
+        numpy_helper.from_array(np.array([2], dtype=np.int64), "end"),
+        numpy_helper.from_array(np.array([-1], dtype=np.int64), "rest"),
+    ]
+    graph = helper.make_graph(nodes, "test", [input_info], [output_info], initializers)
+    # pinned onnxruntime loads IR versions up to 10
+    model = helper.make_model(
+        graph, opset_imports=[helper.make_opsetid("", 13)], ir_version=10
+    )
+    model_path = tmp_path / "model.onnx"
+    onnx.save(model, str(model_path))
+
+    infer_onnx_shapes(model_path)
+
+    output = onnx.load(str(model_path)).graph.output[0]
+    dims = [dim.dim_value for dim in output.type.tensor_type.shape.dim]
+    assert dims == [1, 3, 64]
+
+
+@pytest.mark.skipif(not ONNX_AVAILABLE, reason="onnx not installed")
+def test_infer_onnx_shapes_rejects_invalid_model(tmp_path):
+    """Test that a structurally invalid export is reported."""
+    input_info = helper.make_tensor_value_info("input", TensorProto.FLOAT, [1, 4])
+    output_info = helper.make_tensor_value_info("output", TensorProto.FLOAT, [1, 4])
+    # "missing" is neither a graph input nor produced by a node
+    nodes = [helper.make_node("Add", ["input", "missing"], ["output"])]
+    graph = helper.make_graph(nodes, "test", [input_info], [output_info])
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model_path = tmp_path / "model.onnx"
+    onnx.save(model, str(model_path))
+
+    with pytest.raises(onnx.checker.ValidationError):
+        infer_onnx_shapes(model_path)
+
+
+@pytest.mark.parametrize("cuda_available,device", [(True, "cuda"), (False, "cpu")])
+def test_export_midas_to_onnx_auto_device(tmp_path, mock_torch, cuda_available, device):
+    """Test that device="auto" traces on CUDA only when it is available."""
+    mock_torch.cuda.is_available.return_value = cuda_available
+    model = mock_torch.hub.load.return_value
+
+    with patch("common.utils.model_downloader.infer_onnx_shapes"):
+        export_midas_to_onnx(
+            tmp_path / "cache",
+            tmp_path / "midas.onnx",
+            simplify=False,
+            device="auto",
+        )
+
+    model.eval.return_value.to.assert_called_once_with(device)
+    assert mock_torch.randn.call_args.kwargs["device"] == device
+
+
+def test_export_midas_to_onnx_fingerprints_model_checkpoint(tmp_path, mock_torch):
+    """Test that only the model's own checkpoint decides whether to re-export."""
+    cache_dir = tmp_path / "cache"
+    checkpoints = cache_dir / "checkpoints"
+    checkpoint = checkpoints / "midas_v21_small_256.pt"
+    output_path = tmp_path / "midas.onnx"
+
+    def _download(*args, **kwargs):
+        # torch.hub fetches the weights while loading the model
+        checkpoints.mkdir(parents=True, exist_ok=True)
+        if not checkpoint.exists():
+            checkpoint.write_bytes(b"weights")
+        return MagicMock()
+
+    def _export(model, args, path, **kwargs):
+        Path(path).write_bytes(b"onnx")
+
+    mock_torch.hub.load.side_effect = _download
+    mock_torch.onnx.export.side_effect = _export
+
+    with patch("common.utils.model_downloader.infer_onnx_shapes"):
+        export_midas_to_onnx(cache_dir, output_path, simplify=False)
+        (checkpoints / "dpt_large_384.pt").write_bytes(b"other model")
+        export_midas_to_onnx(cache_dir, output_path, simplify=False)
+        assert mock_torch.onnx.export.call_count == 1
+
+        stat = checkpoint.stat()
+        checkpoint.write_bytes(b"other weights")
+        os.utime(checkpoint, (stat.st_atime, stat.st_mtime))
+        export_midas_to_onnx(cache_dir, output_path, simplify=False)
+        assert mock_torch.onnx.export.call_count == 2
+
+
+@pytest.mark.skipif(
+    not ONNX_AVAILABLE or ort is None, reason="onnx or onnxruntime not installed"
+)
+@pytest.mark.parametrize("level", ["basic", "all"])
+def test_optimize_onnx_graph_writes_loadable_copy(tmp_path, level):
+    """Test the ORT optimized copy is written next to the model and loads."""
+    input_info = helper.make_tensor_value_info("input", TensorProto.FLOAT, [1, 4])
+    output_info = helper.make_tensor_value_info("output", TensorProto.FLOAT, [1, 4])
+    nodes = [
+        helper.make_node("Identity", ["input"], ["hidden"]),
+        helper.make_node("Relu", ["hidden"], ["output"]),
+    ]
+    graph = helper.make_graph(nodes, "test", [input_info], [output_info])
+    # pinned onnxruntime loads IR versions up to 10
+    model = helper.make_model(
+        graph, opset_imports=[helper.make_opsetid("", 13)], ir_version=10
+    )
+    model_path = tmp_path / "model.onnx"
+    onnx.save(model, str(model_path))
+
+    optimized_path = optimize_onnx_graph(model_path, level)
+
+    assert optimized_path == tmp_path / "model_opt.onnx"
+    optimized = onnx.load(str(optimized_path))
+    assert [node.op_type for node in optimized.graph.node] == ["Relu"]
+
+
+@pytest.mark.skipif(ort is None, reason="onnxruntime not installed")
+def test_optimize_onnx_graph_rejects_unknown_level(tmp_path):
+    """Test that an unknown optimization level is reported."""
+    with pytest.raises(ValueError, match="optimization level"):
+        optimize_onnx_graph(tmp_path / "model.onnx", "max")
+
+
+def test_simplify_onnx_graph_slims_in_place(tmp_path):
+    """Test that onnxslim rewrites the model file in place."""
+    model_path = tmp_path / "model.onnx"
+    fake_onnxslim = MagicMock()
+
+    with patch.dict("sys.modules", {"onnxslim": fake_onnxslim}):
+        simplify_onnx_graph(model_path)
+
+    fake_onnxslim.slim.assert_called_once_with(
+        str(model_path), output_model=str(model_path)
+    )
+
+
+def test_simplify_onnx_graph_skips_without_onnxslim(tmp_path):
+    """Test that simplification is skipped when onnxslim is missing."""
+    with patch.dict("sys.modules", {"onnxslim": None}):
+        simplify_onnx_graph(tmp_path / "model.onnx")
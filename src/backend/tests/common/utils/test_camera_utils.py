@@ -5,8 +5,14 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 import cv2
+import numpy as np
 
-from common.utils.camera import open_camera, compute_camera_intrinsics
+from common.utils.camera import (
+    open_camera,
+    compute_camera_intrinsics,
+    configure_pixel_format,
+    mirror_frame,
+)
 
 
 @pytest.mark.parametrize(
@@ -67,6 +73,68 @@ def test_open_camera_tries_fallback_backend(monkeypatch):
         mock_cap_fail.release.assert_called_once()
 
 
+def test_open_camera_prefers_requested_backend(monkeypatch):
+    """Test that a configured backend is tried first and the buffer is limited."""
+    monkeypatch.setattr("sys.platform", "win32")
+
+    mock_cap = MagicMock()
+    mock_cap.isOpened.return_value = True
+
+    with patch("cv2.VideoCapture", return_value=mock_cap) as mock_vc:
+        result = open_camera(0, "msmf")
+
+        assert result == mock_cap
+        mock_vc.assert_called_once_with(0, cv2.CAP_MSMF)
+        mock_cap.set.assert_called_once_with(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+
+def test_open_camera_rejects_unknown_backend():
+    """Test that an unknown backend name is reported instead of ignored."""
+    with pytest.raises(ValueError, match="Unknown OpenCV capture backend"):
+        open_camera(0, "NOPE")
+
+
+@pytest.mark.parametrize(
+    "fourcc,convert_rgb_supported,expected",
+    [
+        ("", True, "bgr24"),
+        ("MJPG", True, "bgr24"),
+        ("YUY2", True, "yuyv422"),
+        ("YUYV", True, "yuyv422"),
+        ("YUY2", False, "bgr24"),
+    ],
+    ids=["default", "mjpg", "yuy2", "yuyv", "yuy2_without_raw_support"],
+)
+def test_configure_pixel_format(fourcc, convert_rgb_supported, expected):
+    """Test that the requested FOURCC maps to the pixel format of read frames."""
+    mock_cap = MagicMock()
+    mock_cap.set.side_effect = lambda prop, value: (
+        convert_rgb_supported if prop == cv2.CAP_PROP_CONVERT_RGB else True
+    )
+
+    assert configure_pixel_format(mock_cap, fourcc) == expected
+    if not fourcc:
+        mock_cap.set.assert_not_called()
+
+
+def test_mirror_frame_bgr():
+    """Test that BGR frames are flipped horizontally into a contiguous array."""
+    frame = np.arange(2 * 4 * 3, dtype=np.uint8).reshape(2, 4, 3)
+    mirrored = mirror_frame(frame, "bgr24")
+    np.testing.assert_array_equal(mirrored, frame[:, ::-1])
+    assert mirrored.flags["C_CONTIGUOUS"]
+
+
+def test_mirror_frame_yuyv422():
+    """Test that YUYV macro-pixels are reversed and their luma samples swapped."""
+    # one row, four pixels: Y0 U0 Y1 V0 | Y2 U1 Y3 V1
+    frame = np.array([[[0, 100], [1, 101], [2, 110], [3, 111]]], dtype=np.uint8)
+    mirrored = mirror_frame(frame, "yuyv422")
+    expected = np.array([[[3, 110], [2, 111], [1, 100], [0, 101]]], dtype=np.uint8)
+    np.testing.assert_array_equal(mirrored, expected)
+    assert mirrored.shape == frame.shape
+
+
 @pytest.mark.parametrize(
     "width,height,fx,fy,cx,cy,fov_x,fov_y,expected",
     [
@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: 2025 robot-visual-perception
+#
+# SPDX-License-Identifier: MIT
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+SCRIPT_PATH = Path(__file__).resolve().parents[3] / "scripts" / "generate_sbom.py"
+
+
+@pytest.fixture(scope="module")
+def generate_sbom():
+    spec = importlib.util.spec_from_file_location("generate_sbom", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        # MIT is mentioned first, but BSD-3-Clause has the higher priority
+        (
+            "Portions are MIT licensed; the rest is distributed under the "
+            "BSD 3-Clause License.",
+            "BSD-3-Clause",
+        ),
+        (
+            "Apache License, Version 2.0. Contributions intentionally submitted",
+            "Apache-2.0",
+        ),
+        # 'permitted' must not be read as MIT
+        ("Redistribution and use in source and binary forms are permitted.", None),
+        ("This library is released under the GNU LGPLv3.", "LGPL-3.0"),
+        ("Licensed under LGPL-2.1 or later.", "LGPL-2.1"),
+        ("Licensed under GPLv2.", "GPL-2.0"),
+        # No SPDX id exists for an unversioned GPL
+        ("Licensed under the GPL.", None),
+    ],
+)
+def test_spdx_id_from_license_text(generate_sbom, text, expected):
+    assert generate_sbom.spdx_id_from_license_text(text) == expected
+
+
+def test_fetch_license_from_pypi_uses_priority_for_long_text(
+    generate_sbom, monkeypatch
+):
+    text = "Parts of this software are MIT licensed. " * 3 + "Overall: BSD-2-Clause."
+    monkeypatch.setattr(
+        generate_sbom, "get_json", lambda url, headers=None: {"info": {"license": text}}
+    )
+
+    assert generate_sbom.fetch_license_from_pypi("pkg", "1.0") == ("BSD-2-Clause", [])
@@ -1,8 +1,13 @@
 # SPDX-FileCopyrightText: 2025 robot-visual-perception
 #
 # SPDX-License-Identifier: MIT
+from unittest.mock import AsyncMock
+
 from fastapi.testclient import TestClient
 
+import streamer.main
+from common.config import config
+from common.core.camera import _shared_cam
 from streamer.main import app
 
 
@@ -30,3 +35,18 @@ def test_offer_requires_offer_type() -> None:
     response = client.post("/offer", json={"sdp": "v=0", "type": "answer"})
     assert response.status_code == 400
     assert "must be 'offer'" in response.json()["detail"].lower()
+
+
+def test_lifespan_prewarms_camera(monkeypatch) -> None:
+    """Test that the webcam is opened at startup and released at shutdown."""
+    acquire = AsyncMock()
+    release = AsyncMock()
+    monkeypatch.setattr(_shared_cam, "acquire", acquire)
+    monkeypatch.setattr(_shared_cam, "release", release)
+    monkeypatch.setattr(config, "CAMERA_PREWARM", True)
+    monkeypatch.setattr(streamer.main, "VIDEO_SOURCE_TYPE", "webcam")
+
+    with TestClient(app):
+        acquire.assert_awaited_once()
+        release.assert_not_awaited()
+    release.assert_awaited_once()
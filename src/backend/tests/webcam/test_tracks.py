@@ -0,0 +1,52 @@
+# SPDX-FileCopyrightText: 2025 robot-visual-perception
+#
+# SPDX-License-Identifier: MIT
+import numpy as np
+
+from common.utils.camera import mirror_frame
+from streamer.tracks import CameraVideoTrack
+
+
+def test_video_frame_is_reused_between_frames():
+    """Test that the camera track refills one VideoFrame for equally sized frames."""
+    track = CameraVideoTrack()
+    first = np.random.randint(0, 255, (5, 7, 3), dtype=np.uint8)
+    second = np.random.randint(0, 255, (5, 7, 3), dtype=np.uint8)
+
+    frame_a = track._to_video_frame(first, "bgr24")
+    np.testing.assert_array_equal(frame_a.to_ndarray(), first)
+
+    frame_b = track._to_video_frame(second, "bgr24")
+    assert frame_b is frame_a
+    np.testing.assert_array_equal(frame_b.to_ndarray(), second)
+
+
+def test_video_frame_is_reallocated_on_format_change():
+    """Test that a new VideoFrame is allocated when size or pixel format changes."""
+    track = CameraVideoTrack()
+    bgr = np.zeros((4, 6, 3), dtype=np.uint8)
+    yuyv = np.random.randint(0, 255, (4, 6, 2), dtype=np.uint8)
+
+    frame_bgr = track._to_video_frame(bgr, "bgr24")
+    frame_yuyv = track._to_video_frame(yuyv, "yuyv422")
+
+    assert frame_yuyv is not frame_bgr
+    assert frame_yuyv.format.name == "yuyv422"
+    np.testing.assert_array_equal(frame_yuyv.to_ndarray(), yuyv)
+
+
+def test_video_frame_mirrors_into_padded_plane():
+    """Test that mirroring writes into the plane even when its rows are padded."""
+    track = CameraVideoTrack()
+    # 7 * 3 bytes per row is padded to PyAV's plane alignment
+    bgr = np.random.randint(0, 255, (5, 7, 3), dtype=np.uint8)
+    yuyv = np.random.randint(0, 255, (4, 6, 2), dtype=np.uint8)
+
+    frame_bgr = track._to_video_frame(bgr, "bgr24", mirror=True)
+    assert frame_bgr.planes[0].line_size > 7 * 3
+    np.testing.assert_array_equal(frame_bgr.to_ndarray(), bgr[:, ::-1])
+
+    frame_yuyv = track._to_video_frame(yuyv, "yuyv422", mirror=True)
+    np.testing.assert_array_equal(
+        frame_yuyv.to_ndarray(), mirror_frame(yuyv, "yuyv422")
+    )